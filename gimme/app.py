@@ -1,7 +1,8 @@
 import os
 import sys
 from .routes import Routes
-from .errors import TemplateError
+from .headers import ResponseHeaders
+from .errors import TemplateError, GimmeError
 from .wsgi import WSGIAdapter
 #from .servers.http import HTTPServer
 from .servers.logger import SysLogger
@@ -47,6 +48,11 @@ class App(object):
     .. attribute:: dirname
 
         Stores the path information from where the app was started from.
+
+    .. attribute:: frozen
+
+        Whether or not :meth:`freeze() <gimme.app.App.freeze>` has been
+        called.
     '''
 
     def __init__(self, name='gimme', engine=Jinja2Engine(), logger=SysLogger):
@@ -60,6 +66,9 @@ class App(object):
 
         self.dirname = os.path.dirname(os.path.abspath(sys.argv[0]))
 
+        self.frozen = False
+        self._default_headers = None
+
         # Dictionary to store defined params
         self._params = {}
 
@@ -74,10 +83,29 @@ class App(object):
         }
 
     def __call__(self, environ, start_response):
-        # Disabled because sort is not implemented in a very useful way (yet)
-        # self.routes._sort()
         return self._wsgi.process(environ, start_response)
 
+    def freeze(self):
+        '''
+        Does all of the preparation that would otherwise happen lazily
+        during the first requests: routes are sorted by priority, their
+        lookup structures are built, each route's middleware is resolved
+        and the default headers are rendered. Afterwards, adding routes or
+        middleware raises an error instead of quietly slowing things down.
+
+        This is called by :meth:`listen() <gimme.app.App.listen>` and
+        :meth:`server() <gimme.app.App.server>`. Apps that are handed to a
+        WSGI server some other way should call it themselves::
+
+            WSGIServer(app.freeze()).run()
+
+        :return: The app.
+        '''
+        if not self.frozen:
+            self.routes.freeze()
+            self.frozen = True
+        return self
+
     def listen(self, host='127.0.0.1', port=8080, server_class=WSGIServer):
         '''
         Starts the built-in development webserver.
@@ -94,7 +122,7 @@ class App(object):
         start_servers(servers)
 
     def server(self, host='127.0.0.1', port=8080, server_class=WSGIServer):
-        return server_class((host, port), self)
+        return server_class((host, port), self.freeze())
 
     def use(self, middleware):
         '''
@@ -108,6 +136,9 @@ class App(object):
 
         :param middleware: The middleware to add to the app.
         '''
+        if self.frozen:
+            raise GimmeError("Middleware cannot be added once the app has "
+                "been frozen.")
         self.middleware.append(middleware)
 
     def set(self, key, value):
@@ -120,6 +151,9 @@ class App(object):
         '''
         self._config[key] = value
 
+        if key == 'default headers':
+            self._default_headers = None
+
     def get(self, key, default=None):
         '''
         Gets a key from the app, previously set with
@@ -129,6 +163,20 @@ class App(object):
         '''
         return self._config.get(key, default)
 
+    def get_default_headers(self):
+        '''
+        Returns the ``default headers`` config value as a frozen
+        :class:`ResponseHeaders <gimme.headers.ResponseHeaders>`. Responses
+        created from it share its headers until they change them. It is
+        built on first use and again only after ``default headers`` is
+        :meth:`set() <gimme.app.App.set>`, so the config value should be
+        replaced rather than modified in place.
+        '''
+        if self._default_headers is None:
+            self._default_headers = ResponseHeaders(
+                self.get('default headers', {})).freeze()
+        return self._default_headers
+
     def param(self, name, callback):
         self.params[name] = callback
 
@@ -1,8 +1,102 @@
 from dogpile.cache.api import CacheBackend, NO_VALUE
+from collections import OrderedDict
 import pickle
 import os
 
 
+class LRUCache(object):
+    '''
+    A bounded, in-process mapping that evicts the least recently used key
+    once more than ``size`` keys are stored. Hits and misses are counted so
+    that the size can be tuned.
+
+    Given a ``weigh`` function, the cache is bounded by the total weight of
+    its values rather than by their number, so that it can hold, say, a
+    number of bytes::
+
+        LRUCache(1024 * 1024, weigh=len)
+
+    Values heavier than ``size`` on their own are not stored.
+
+    :param int size: The maximum number of keys (or total weight) to keep.
+    :param weigh: An optional function that returns the weight of a value.
+
+    .. attribute:: hits
+
+        The number of :meth:`get` calls that found their key.
+
+    .. attribute:: misses
+
+        The number of :meth:`get` calls that did not.
+    '''
+    def __init__(self, size=1024, weigh=None):
+        self.size = size
+        self.weigh = weigh
+        self.weight = 0
+        self.hits = 0
+        self.misses = 0
+        self._data = OrderedDict()
+
+    def __contains__(self, key):
+        return key in self._data
+
+    def __len__(self):
+        return len(self._data)
+
+    def get(self, key, default=None):
+        try:
+            value = self._data.pop(key)
+        except KeyError:
+            self.misses += 1
+            return default
+
+        self._data[key] = value
+        self.hits += 1
+        return value
+
+    def _weigh(self, value):
+        return self.weigh(value) if self.weigh is not None else 1
+
+    def set(self, key, value):
+        if key in self._data:
+            self.weight -= self._weigh(self._data.pop(key))
+
+        weight = self._weigh(value)
+        if weight > self.size:
+            return
+
+        self._data[key] = value
+        self.weight += weight
+
+        while self.weight > self.size:
+            self.weight -= self._weigh(self._data.popitem(last=False)[1])
+
+    def clear(self):
+        self._data.clear()
+        self.weight = 0
+
+    @property
+    def hit_rate(self):
+        '''
+        The fraction of lookups that were hits, or ``0.0`` before the first
+        lookup.
+        '''
+        total = self.hits + self.misses
+        return float(self.hits) / total if total else 0.0
+
+    def info(self):
+        '''
+        Returns a dict of ``hits``, ``misses``, ``size`` (the number of keys
+        currently stored) and ``max_size``.
+        '''
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'size': len(self._data),
+            'max_size': self.size
+        }
+
+
 class Memory(CacheBackend):
     cache = {}
 
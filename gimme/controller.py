@@ -272,33 +272,91 @@ class Controller(object):
 
 
 class ErrorController(Controller):
+    '''
+    Renders the error pages. The Jinja environment and the compiled error
+    templates are shared by every instance, so an error costs a template
+    render and nothing more.
+
+    If the app's ``static errors`` setting is true, each page is rendered
+    once per status code (without request details such as tracebacks) and
+    the same bytes are served from then on::
+
+        app.set('static errors', True)
+    '''
+
+    _environment = None
+    _templates = {}
+    _static_bodies = {}
+
     def __init__(self, *args, **kwargs):
         Controller.__init__(self, *args, **kwargs)
-        self.environment = Environment(
-            loader=PackageLoader('gimme', 'templates'))
+        self.environment = self._get_environment()
+
+    @classmethod
+    def _get_environment(cls):
+        if ErrorController._environment is None:
+            ErrorController._environment = Environment(
+                loader=PackageLoader('gimme', 'templates'))
+        return ErrorController._environment
+
+    @classmethod
+    def _get_template(cls, name):
+        try:
+            return cls._templates[name]
+        except KeyError:
+            template = cls._get_environment().get_template(name)
+            cls._templates[name] = template
+            return template
+
+    def _render(self, name, response, context, static_context=None):
+        if self.app is not None and self.app.get('static errors'):
+            key = (name, str(response._status), response.charset)
+            try:
+                return self._static_bodies[key]
+            except KeyError:
+                if static_context is None:
+                    static_context = context
+                body = self._get_template(name).render(
+                    static_context).encode(response.charset, 'ignore')
+                self._static_bodies[key] = body
+                return body
+
+        return self._get_template(name).render(context).encode(
+            response.charset, 'ignore')
 
     def http404(self, request, response):
         response.status = 404
 
-        return self.environment.get_template('errors/404.html').render({
+        return self._render('errors/404.html', response, {
             'headers': request.headers,
-        }).encode(response.charset, 'ignore')
+        }, {})
 
     def http500(self, request, response):
         response.status = 500
         e_type, e_value, e_traceback = sys.exc_info()
         traceback.print_exception(e_type, e_value, e_traceback)
+        message = "Oh snap! Something's borked. :("
 
-        return self.environment.get_template('errors/500.html').render({
-            'message': "Oh snap! Something's borked. :(",
+        return self._render('errors/500.html', response, {
+            'message': message,
             'headers': request.headers,
             'traceback': traceback.format_exception(
                 e_type,
                 e_value,
                 e_traceback)
-        }).encode(response.charset, 'ignore')
+        }, {'message': message, 'traceback': []})
+
+    def http405(self, request, response):
+        response.status = 405
+
+        return self._render('errors/generic.html', response, {
+            'status': response._status
+        })
+
+    def options(self, request, response):
+        return ''
 
     def generic(self, request, response):
-        return self.environment.get_template('errors/generic.html').render({
+        return self._render('errors/generic.html', response, {
             'status': response._status
-        }).encode(response.charset, 'ignore')
+        })
@@ -0,0 +1,334 @@
+import abc
+import re
+from operator import itemgetter
+
+
+class BaseDispatcher(object):
+    '''
+    The base class that all dispatchers should derive from.
+
+    A dispatcher is built from a list of :class:`RouteMapping
+    <gimme.routes.RouteMapping>` objects and is responsible for finding the
+    first of them (in list order) that matches a given URI.
+    :class:`Routes <gimme.routes.Routes>` builds one dispatcher per request
+    method list and rebuilds it whenever routes are added.
+
+    :param mappings: A list of :class:`RouteMapping
+        <gimme.routes.RouteMapping>` objects.
+    '''
+
+    __metaclass__ = abc.ABCMeta
+
+    def __init__(self, mappings):
+        self.mappings = list(mappings)
+
+        # Mappings that come before the first one with a match_fn; a lookup
+        # that ends at one of these never consulted the environ.
+        self._environ_free = set()
+        for mapping in self.mappings:
+            if mapping.match_fn:
+                break
+            self._environ_free.add(id(mapping))
+
+    def cacheable(self, mapping=None):
+        '''
+        Whether a lookup that resolved to ``mapping`` (or to nothing, if
+        ``mapping`` is ``None``) resolves the same way for every environ,
+        meaning that no ``match_fn`` could have been consulted.
+        '''
+        if mapping is None:
+            return len(self._environ_free) == len(self.mappings)
+        return id(mapping) in self._environ_free
+
+    @abc.abstractmethod
+    def match(self, uri, environ):
+        '''
+        Returns a tuple of the matching :class:`RouteMapping
+        <gimme.routes.RouteMapping>` and a :class:`PatternMatch
+        <gimme.routes.PatternMatch>`, or ``None`` if nothing matches.
+
+        :param uri: The URI to match, relative to ``SCRIPT_NAME``.
+        :param environ: The WSGI environ dict; passed on to ``match_fn``.
+        '''
+        pass
+
+    def _entries(self):
+        '''
+        Yields ``(key, mapping, route)`` for every :class:`Route
+        <gimme.routes.Route>` in every mapping. Sorting by ``key`` gives the
+        order in which a linear scan would have tried the routes.
+        '''
+        for i, mapping in enumerate(self.mappings):
+            routes = mapping.pattern
+            if not isinstance(routes, list):
+                routes = [routes]
+            for j, route in enumerate(routes):
+                yield ((i, j), mapping, route)
+
+    def _accepts(self, mapping, uri, environ):
+        return not mapping.match_fn or mapping.match_fn(uri, environ)
+
+
+class LinearDispatcher(BaseDispatcher):
+    '''
+    Tries each mapping's regex in turn until one matches. This is how Gimme
+    has always matched routes; it is kept around for comparison and for
+    applications that depend on pure regex semantics.
+    '''
+
+    def match(self, uri, environ):
+        for mapping in self.mappings:
+            if self._accepts(mapping, uri, environ):
+                match = mapping.pattern.match(uri)
+                if match:
+                    return (mapping, match)
+        return None
+
+
+class _Node(object):
+    __slots__ = ('static', 'params', 'terminals', 'last')
+
+    def __init__(self):
+        # segment -> _Node
+        self.static = {}
+        # (name, optional, validator) -> _Node
+        self.params = {}
+        # (key, mapping, route) for routes that end at this node
+        self.terminals = []
+        # (key, mapping, route, name, optional, validator) for routes whose
+        # final segment is a trailing parameter (see
+        # TreeDispatcher._collect_last)
+        self.last = []
+
+
+class TreeDispatcher(BaseDispatcher):
+    '''
+    Resolves URIs by walking a tree of path segments built from the string
+    patterns of the mappings, so the cost of a lookup depends on the number
+    of segments in the URI rather than on the number of routes.
+
+    Static segments, ``:param`` and ``:param?`` placeholders (typed or not)
+    and the ``*`` catch-all are all handled by the tree. Routes created from a compiled
+    regex (or from a string containing regex syntax) are matched with their
+    regex, interleaved with the tree results so that the first registered
+    route still wins.
+
+    Note that static segments are compared literally, so ``/robots.txt``
+    no longer matches ``/robotsXtxt`` the way its regex would.
+    '''
+
+    _param_value = re.compile('^[a-zA-Z0-9_\-\.,]+$')
+
+    def __init__(self, mappings):
+        BaseDispatcher.__init__(self, mappings)
+        self._root = _Node()
+        self._wildcards = []
+        self._fallback = []
+
+        for key, mapping, route in self._entries():
+            if route.wildcard:
+                self._wildcards.append((key, mapping, route))
+            elif route.segments is None:
+                self._fallback.append((key, mapping, route))
+            else:
+                self._insert(key, mapping, route)
+
+    def _insert(self, key, mapping, route):
+        node = self._root
+        for kind, value, optional, validator in route.segments:
+            if kind == 'static':
+                node = node.static.setdefault(value, _Node())
+            elif kind == 'param':
+                node = node.params.setdefault((value, optional, validator),
+                    _Node())
+            else:
+                node.last.append((key, mapping, route, value, optional,
+                    validator))
+                return
+        node.terminals.append((key, mapping, route))
+
+    def _collect(self, node, segments, i, params, found):
+        remaining = len(segments) - i
+
+        if node.last and remaining <= 2:
+            self._collect_last(node.last, segments[i:], params, found)
+
+        if not remaining:
+            for key, mapping, route in node.terminals:
+                found.append((key, mapping, route, dict(params)))
+            return
+
+        segment = segments[i]
+        child = node.static.get(segment)
+        if child is not None:
+            self._collect(child, segments, i + 1, params, found)
+
+        for (name, optional, validator), child in node.params.iteritems():
+            if segment:
+                if not (validator or self._param_value).match(segment):
+                    continue
+                params[name] = segment
+            elif optional:
+                params[name] = None
+            else:
+                continue
+            self._collect(child, segments, i + 1, params, found)
+            del params[name]
+
+    def _collect_last(self, entries, rest, params, found):
+        # A trailing "/:param" compiles to a regex that makes the whole
+        # segment optional, allows one trailing slash and records whether
+        # the slash before the parameter was present in "__last". The table
+        # below mirrors what that regex yields for the remaining segments.
+        if not rest:
+            required = optional = (None, None)
+        elif rest == ['']:
+            required, optional = (None, None), (None, '/')
+        elif rest == ['', '']:
+            required, optional = None, (None, '/')
+        elif len(rest) == 1 or rest[1] == '':
+            required = optional = (rest[0], '/')
+        else:
+            return
+
+        for key, mapping, route, name, is_optional, validator in entries:
+            result = optional if is_optional else required
+            if result is None or (result[0] is not None and
+                    not (validator or self._param_value).match(result[0])):
+                continue
+
+            route_params = dict(params)
+            route_params[name], route_params['__last'] = result
+            found.append((key, mapping, route, route_params))
+
+    def match(self, uri, environ):
+        found = []
+        self._collect(self._root, uri.split('/'), 0, {}, found)
+        for key, mapping, route in self._wildcards:
+            found.append((key, mapping, route, {}))
+        found.sort(key=itemgetter(0))
+
+        position = 0
+        for key, mapping, route in self._fallback:
+            while position < len(found) and found[position][0] < key:
+                result = self._accept(found[position], uri, environ)
+                if result:
+                    return result
+                position += 1
+
+            if self._accepts(mapping, uri, environ):
+                match = route.match(uri)
+                if match:
+                    return (mapping, match)
+
+        for candidate in found[position:]:
+            result = self._accept(candidate, uri, environ)
+            if result:
+                return result
+        return None
+
+    def _accept(self, candidate, uri, environ):
+        key, mapping, route, params = candidate
+        if self._accepts(mapping, uri, environ):
+            match = route.make_match(params)
+            if match:
+                return (mapping, match)
+        return None
+
+
+class RegexDispatcher(BaseDispatcher):
+    '''
+    Compiles the regexes of all routes into alternations, so that finding
+    the matching route takes a single :func:`re.match` call rather than one
+    per route. This suits applications that mostly register routes as
+    compiled regexes, which :class:`TreeDispatcher` can only try in turn.
+
+    Each route becomes a named branch, and the named groups inside it are
+    prefixed with the branch name so that they can't collide. Routes that
+    can't be combined (numbered backreferences, inline or compile flags)
+    are tried on their own, in order.
+    '''
+
+    # The re module in Python 2 refuses patterns with 100 or more groups.
+    _max_groups = 99
+
+    _named_group = re.compile(
+        r'(?<!\\)\(\?(P<|P=|\()([a-zA-Z_][a-zA-Z0-9_]*)(?=[>)])')
+    _unsupported = re.compile(r'\\[1-9]|\(\?[iLmsux]+\)|\(\?\([0-9]')
+
+    def __init__(self, mappings):
+        BaseDispatcher.__init__(self, mappings)
+        self._chunks = []
+
+        pending = []
+        groups = 0
+
+        for key, mapping, route in self._entries():
+            regex = route.regex
+            if (regex.flags or regex.groups >= self._max_groups or
+                    self._unsupported.search(regex.pattern)):
+                self._flush(pending)
+                self._chunks.append((None, [(mapping, route, None)]))
+                pending, groups = [], 0
+                continue
+
+            if groups + regex.groups + 1 > self._max_groups:
+                self._flush(pending)
+                pending, groups = [], 0
+
+            pending.append((mapping, route))
+            groups += regex.groups + 1
+
+        self._flush(pending)
+
+    def _flush(self, pending):
+        if not pending:
+            return
+
+        branches = []
+        patterns = []
+
+        for i, (mapping, route) in enumerate(pending):
+            prefix = '_r%s' % i
+            names = []
+
+            def rename(match):
+                if match.group(1) == 'P<':
+                    names.append(('%s_%s' % (prefix, match.group(2)),
+                        match.group(2)))
+                return '(?%s%s_%s' % (match.group(1), prefix, match.group(2))
+
+            pattern = self._named_group.sub(rename, route.regex.pattern)
+            patterns.append('(?P<%s>%s)' % (prefix, pattern))
+            branches.append((mapping, route, names))
+
+        self._chunks.append((re.compile('|'.join(patterns)), branches))
+
+    def match(self, uri, environ):
+        for regex, branches in self._chunks:
+            start = 0
+
+            if regex is not None:
+                match = regex.match(uri)
+                if not match:
+                    continue
+
+                start = int(match.lastgroup[2:])
+                mapping, route, names = branches[start]
+                if self._accepts(mapping, uri, environ):
+                    params = dict((original, match.group(name))
+                        for name, original in names)
+                    result = route.make_match(params)
+                    if result:
+                        return (mapping, result)
+                start += 1
+
+            # The winning branch was turned down by its match_fn or its
+            # parameters could not be converted (or the routes could not be
+            # combined), so try the rest one at a time.
+            for mapping, route, names in branches[start:]:
+                if self._accepts(mapping, uri, environ):
+                    match = route.match(uri)
+                    if match:
+                        return (mapping, match)
+        return None
@@ -31,9 +31,13 @@ class Jinja2Engine(BaseEngine):
     :param environment: A Jinja2 :class:`Environment <jinja2.Environment>`
         object. Defaults to ``None``. If provided, ``template_path`` is
         ignored.
+    :param manifest: An :class:`AssetManifest <gimme.static.AssetManifest>`
+        whose :meth:`url <gimme.static.AssetManifest.url>` method templates
+        can call as ``static_url()``.
     '''
 
-    def __init__(self, template_path='views', environment=None):
+    def __init__(self, template_path='views', environment=None,
+            manifest=None):
         app_path = os.path.dirname(os.path.abspath(sys.argv[0]))
         if not environment:
             environment = Environment(loader=ChoiceLoader([
@@ -41,5 +45,8 @@ class Jinja2Engine(BaseEngine):
             ]))
         self.environment = environment
 
+        if manifest is not None:
+            environment.globals['static_url'] = manifest.url
+
     def render(self, template, data):
         return self.environment.get_template(template).render(data).encode('utf-8')
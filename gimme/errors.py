@@ -32,6 +32,10 @@ class AbortRender(GimmeError):
     pass
 
 
+# ErrorController method -> RouteMapping, shared by every HTTPError
+_routes = {}
+
+
 class HTTPError(GimmeError):
     def __init__(self, status=500):
         self.status = status
@@ -41,8 +45,23 @@ class HTTPError(GimmeError):
         except AttributeError:
             method = controller.ErrorController.generic
 
-        self.route = gimme.routes.RouteMapping('*', [], method,
-            controller.ErrorController(None))
+        self.route = self._get_route(method)
+
+    @staticmethod
+    def _get_route(method):
+        try:
+            return _routes[method.__name__]
+        except KeyError:
+            # ControllerMethod.controller_instance is shared by every
+            # instance of the controller; only create one if the routes of
+            # an app haven't already.
+            instance = getattr(method, 'controller_instance', None)
+            if instance is None:
+                instance = controller.ErrorController(None)
+
+            route = gimme.routes.RouteMapping('*', [], method, instance)
+            _routes[method.__name__] = route
+            return route
 
     def make_response(self, app):
         res = response.Response(self.status)
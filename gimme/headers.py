@@ -1,11 +1,27 @@
-from .dotdict import DotDict
+import collections
+from collections import OrderedDict
 
 
 class Header(object):
+    '''
+    A single header. Headers that belong to a frozen :class:`HeadersDict`
+    are read-only, since they are shared by every object created from it.
+    '''
+    _frozen = False
+
     def __init__(self, key, value):
         self.key = key
         self.value = value
 
+    def __setattr__(self, key, value):
+        if self._frozen:
+            raise TypeError("Frozen headers cannot be modified.")
+        object.__setattr__(self, key, value)
+
+    def freeze(self):
+        object.__setattr__(self, '_frozen', True)
+        return self
+
     def __str__(self):
         return "%s: %s" % (self.key, self.value)
 
@@ -20,10 +36,32 @@ class Header(object):
 
 
 class HeadersDict(object):
+    '''
+    An ordered collection of :class:`Header` objects that can be used like a
+    dict. Keys are case-insensitive and looked up through an index, and a
+    key may have several headers (``Set-Cookie``, ``Link``), added with
+    :meth:`add_header`. Item access and assignment deal with the first
+    header of a key.
+
+    Creating a ``HeadersDict`` from one that has been :meth:`frozen
+    <freeze>` doesn't copy anything: the headers are shared until the new
+    object is first modified. The shared :class:`Header` objects are
+    frozen too, so change values by assigning to the dict rather than to a
+    :class:`Header` it returned.
+    '''
     def __init__(self, initial_data=None):
         self._headers = []
-
-        if initial_data:
+        # Lowercase key -> list of Header objects, in order
+        self._index = OrderedDict()
+        self._frozen = False
+        # The frozen HeadersDict whose headers are shared, if any
+        self._template = None
+
+        if isinstance(initial_data, HeadersDict) and initial_data._frozen:
+            self._headers = initial_data._headers
+            self._index = initial_data._index
+            self._template = initial_data
+        elif initial_data:
             self.update(initial_data)
 
     def __setitem__(self, key, value):
@@ -36,10 +74,10 @@ class HeadersDict(object):
         return header
 
     def __delitem__(self, key):
-        self._headers.remove(self[key])
+        self.del_header(self[key])
 
     def __contains__(self, key):
-        return bool(self._get_header(key))
+        return key.lower() in self._index
 
     def __len__(self):
         return len(self._headers)
@@ -66,24 +104,33 @@ class HeadersDict(object):
                 return False
         return True
 
+    def _modify(self):
+        if self._frozen:
+            raise TypeError("Frozen headers cannot be modified.")
+
+        if self._template is not None:
+            headers = self._headers
+            self._headers = []
+            self._index = OrderedDict()
+            self._template = None
+            for header in headers:
+                self.add_header(Header(header.key, header.value))
+
     def _set_header(self, key, value):
+        self._modify()
         header = self._get_header(key)
         if not header:
-            header = Header(key, value)
-            self._headers.append(header)
+            self.add_header(Header(key, value))
         else:
             header.value = value
         return self
 
     def _get_header(self, key):
-        for header in self._headers:
-            if header.key == key:
-                return header
-        return None
+        headers = self._index.get(key.lower())
+        return headers[0] if headers else None
 
     def keys(self):
-        keys = [i.key for i in self._headers]
-        return list(set(keys))
+        return [headers[0].key for headers in self._index.itervalues()]
 
     def values(self):
         return [i.value for i in self._headers]
@@ -103,36 +150,173 @@ class HeadersDict(object):
             self[key] = value
 
     def add_header(self, header):
+        self._modify()
         self._headers.append(header)
+        self._index.setdefault(header.key.lower(), []).append(header)
 
     def del_header(self, header):
+        if self._template is not None:
+            # The copy holds new Header objects, so find the one that
+            # corresponds to ``header``.
+            position = self._headers.index(header)
+            self._modify()
+            header = self._headers[position]
+        else:
+            self._modify()
+
         self._headers.remove(header)
 
+        key = header.key.lower()
+        headers = self._index[key]
+        headers.remove(header)
+        if not headers:
+            del self._index[key]
+
     def render(self):
         return '\r\n'.join(map(str, self._headers)) + '\r\n\r\n'
 
     def copy(self):
         copy = HeadersDict()
-        copy._headers = list(self._headers)
+        for header in self._headers:
+            if header._frozen:
+                header = Header(header.key, header.value)
+            copy.add_header(header)
         return copy
 
     def clear(self):
-        del(self._headers[:])
+        if self._frozen:
+            raise TypeError("Frozen headers cannot be modified.")
+
+        self._headers = []
+        self._index = OrderedDict()
+        self._template = None
+
+    def freeze(self):
+        '''
+        Makes the headers read-only, so that they can be shared by the
+        objects created from them.
+
+        :return: self
+        '''
+        self._frozen = True
+        for header in self._headers:
+            header.freeze()
+        return self
 
     def get(self, key, default=None):
-        return self[key] if key in self else default
+        header = self._get_header(key)
+        return header if header else default
 
     def get_all(self, key):
-        headers = []
-        for i in self:
-            if i.key == key:
-                headers.append(i)
-        return headers
+        return list(self._index.get(key.lower(), []))
+
+
+class RequestHeaders(collections.Mapping):
+    '''
+    A read-only view of the request headers in a WSGI environ. Keys are
+    lowercase with the ``HTTP_`` prefix removed, so ``HTTP_USER_AGENT`` is
+    available as ``headers.user_agent`` or ``headers['user_agent']`` and
+    ``REQUEST_METHOD`` as ``headers.request_method``. The ``wsgi.*`` keys
+    are left out; with ``wsgi=True``, the view holds only those keys
+    instead (``wsgi.input`` becomes ``input``).
+
+    Nothing is copied, so changes to the environ show up immediately.
+
+    :param environ: The WSGI environ dict.
+    :param bool wsgi: Whether to view the ``wsgi.*`` keys.
+    '''
+
+    def __init__(self, environ, wsgi=False):
+        object.__setattr__(self, '_environ', environ)
+        object.__setattr__(self, '_wsgi', wsgi)
+
+    def __getitem__(self, key):
+        key = key.lower()
+        environ = self._environ
+
+        if self._wsgi:
+            return environ['wsgi.' + key]
 
+        if not key.startswith('wsgi.'):
+            upper = key.upper()
+            for name in ('HTTP_' + upper, upper, key):
+                if name in environ:
+                    return environ[name]
+        raise KeyError(key)
 
-class RequestHeaders(DotDict):
-    pass
+    def __iter__(self):
+        seen = set()
+        for name in self._environ:
+            key = name.lower()
+            if key.startswith('wsgi.'):
+                if not self._wsgi:
+                    continue
+                key = key[5:]
+            elif self._wsgi:
+                continue
+            elif key.startswith('http_'):
+                key = key[5:]
+
+            if key not in seen:
+                seen.add(key)
+                yield key
+
+    def __len__(self):
+        return sum(1 for key in self)
+
+    def __getattr__(self, key):
+        if key.startswith('__'):
+            raise AttributeError(key)
+        try:
+            return self[key]
+        except KeyError, e:
+            raise AttributeError(e)
+
+    def __setattr__(self, key, value):
+        raise TypeError("Request headers are read-only; modify the environ "
+            "instead.")
+
+    def __repr__(self):
+        return repr(dict(self))
 
 
 class ResponseHeaders(HeadersDict):
-    pass
+    def get_wsgi_headers(self, content_type):
+        '''
+        Returns the headers as the list of ``(key, value)`` tuples that WSGI
+        expects, with "Content-Type" set to ``content_type``. While the
+        headers are shared with a frozen template, the list is built once
+        per content type and copied.
+
+        :param str content_type: The value of the "Content-Type" header.
+        '''
+        template = self._template
+        if template is None:
+            return self._make_wsgi_headers(content_type)
+
+        try:
+            cache = template._wsgi_headers
+        except AttributeError:
+            cache = template._wsgi_headers = {}
+
+        try:
+            return list(cache[content_type])
+        except KeyError:
+            result = self._make_wsgi_headers(content_type)
+            if len(cache) < 32:
+                cache[content_type] = tuple(result)
+            return result
+
+    def _make_wsgi_headers(self, content_type):
+        header = self.get('Content-Type')
+        result = []
+
+        for i in self._headers:
+            if i is header:
+                result.append((i.key, content_type))
+            elif i.key.lower() != 'content-type':
+                result.append((i.key, i.value))
+
+        if header is None:
+            result.append(('Content-Type', content_type))
+        return result
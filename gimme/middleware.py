@@ -13,6 +13,7 @@ from .parsers.contenttype import ContentType
 from .dotdict import DotDict
 from .ext.session import Session as Session
 from .errors import AbortRender
+from .static import StaticFiles
 from jinja2 import Environment, PackageLoader, ChoiceLoader, FileSystemLoader
 
 
@@ -113,65 +114,59 @@ def connection_helper(connection='close'):
     class ConnectionHelperMiddleware(Middleware):
         def exit(self):
             self.response.headers['Connection'] = connection
-            self.response.headers['Content-Length'] = str(len(
-                self.response.body))
+
+            length = self.response.body.length
+            if length is not None:
+                self.response.headers['Content-Length'] = str(length)
 
     return ConnectionHelperMiddleware
 
 
-def static(path, expose_as='/'):
+def static(path, expose_as='/', cache_control=None,
+        encodings=(('gzip', '.gz'),), memory_size=0, memory_file_size=65536,
+        check_interval=1, manifest=None):
     '''
     Exposes a directory to the application to be serviced as static files::
 
         app.use(gimme.middleware.static('images'))
 
+    Files are sent with the server's ``wsgi.file_wrapper`` if it has one,
+    and closed by the server once they have been sent. Conditional requests
+    are answered with ``304 Not Modified`` when the file hasn't changed;
+    see :class:`StaticFiles <gimme.static.StaticFiles>`.
+
+    Mounting the directory with :meth:`Routes.static
+    <gimme.routes.Routes.static>` instead serves files without running the
+    middleware, and doesn't cost other requests anything.
+
     :param path: The local filesystem path to expose.
     :param expose_as: An optional name to prefix the exposed files as. For
         example, if you wanted to expose an "/var/images" directory as "imgs"
         to the world, you would do
         ``app.use(static('/var/images', '/imgs/'))``.
+    :param cache_control: The "Cache-Control" header to send, either for
+        every file or as a dict of URI prefixes and values. Integers are
+        taken as a max-age in seconds.
+    :param encodings: The precompressed copies to look for, as a list of
+        ``(encoding, suffix)`` tuples; ``app.js.gz`` is sent instead of
+        ``app.js`` to clients that accept gzip by default.
+    :param memory_size: The total bytes of small files to keep in memory,
+        or ``0`` to always read files from disk.
+    :param memory_file_size: The largest file to keep in memory.
+    :param check_interval: How often, in seconds, files kept in memory are
+        checked for changes.
+    :param manifest: An :class:`AssetManifest <gimme.static.AssetManifest>`
+        to fingerprint the files with. Fingerprinted URIs are served with
+        an immutable "Cache-Control" header.
     '''
-    import mimetypes
-
-    expose_as = (expose_as or os.path.basename(path)).strip('/')
-    pattern = re.compile('^/%s.*' % re.escape(expose_as))
-    mimetypes.init()
+    files = StaticFiles(path, expose_as or os.path.basename(path),
+        cache_control, encodings, memory_size, memory_file_size,
+        check_interval, manifest)
 
     class StaticMiddleware(Middleware):
         def enter(self):
-            match = pattern.match(self.request.headers.path_info)
-            local_path = None
-
-            if match:
-                local_path = self._get_local_path(
-                    self.request.headers.path_info)
-                if local_path:
-                    self.response.type = (mimetypes.guess_type(local_path)[0]
-                        or 'application/x-octet-stream')
-                    self.response.status = 200
-                    try:
-                        self.response.body = open(local_path, 'r')
-                    except OSError, e:
-                        pass
-                    else:
-                        self.response.locals._staticfile = True
-                    finally:
-                        raise AbortRender
-
-        def _get_local_path(self, local_path):
-            local_path = local_path.strip('/')[len(expose_as):].lstrip('/')
-            temp_path = os.path.join(path, local_path)
-            if temp_path.startswith(path) and os.path.isfile(temp_path):
-                return temp_path
-            else:
-                return None
-
-        def exit(self):
-            if self.response.locals.get('_staticfile', False):
-                try:
-                    self.response.body.body.close()
-                except OSError:
-                    print "ERROR CLOSING FILE"
+            if files.serve(self.request, self.response):
+                raise AbortRender
 
     return StaticMiddleware
 
@@ -359,7 +354,7 @@ def method_override():
             if self.request.type == 'application/x-www-form-urlencoded':
                 query_string = QueryString(self.request.raw_body)
                 if '_method' in query_string:
-                    self.request.headers.request_method = query_string._method
+                    self.request.environ['REQUEST_METHOD'] = query_string._method
 
     return MethodOverrideMiddleware
 
@@ -377,6 +372,9 @@ def compress(types=['application/json', 'application/javascript', 'text/*']):
             except (ValueError, KeyError):
                 return
 
+            if 'Content-Encoding' in self.response.headers:
+                return
+
             if 'accept_encoding' in self.request.headers:
                 if ('deflate' in
                         self.request.headers.accept_encoding.split(',') and
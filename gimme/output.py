@@ -1,40 +1,179 @@
+import os
 import types
 
 
+class FileIterator(object):
+    '''
+    Reads a file in blocks of ``block_size`` bytes. This is what file bodies
+    are sent with when the WSGI server doesn't provide
+    ``wsgi.file_wrapper``.
+
+    :param fileobj: The file to read.
+    :param int block_size: The number of bytes to read at a time.
+    '''
+    def __init__(self, fileobj, block_size=65536):
+        self.fileobj = fileobj
+        self.block_size = block_size
+
+    def __iter__(self):
+        read = self.fileobj.read
+        block_size = self.block_size
+        while True:
+            data = read(block_size)
+            if not data:
+                break
+            yield data
+
+    def close(self):
+        self.fileobj.close()
+
+
+class FileRangeIterator(object):
+    '''
+    Sends parts of a file, as needed for byte range responses. Each segment
+    is either a string, which is sent as it is, or a ``(start, end)`` tuple
+    of inclusive offsets, which are read from the file in blocks of
+    ``block_size`` bytes.
+
+    :param fileobj: The file to read.
+    :param segments: A list of strings and ``(start, end)`` tuples.
+    :param int block_size: The number of bytes to read at a time.
+    '''
+    def __init__(self, fileobj, segments, block_size=65536):
+        self.fileobj = fileobj
+        self.segments = segments
+        self.block_size = block_size
+
+    def __iter__(self):
+        fileobj = self.fileobj
+
+        for segment in self.segments:
+            if isinstance(segment, str):
+                yield segment
+                continue
+
+            start, end = segment
+            fileobj.seek(start)
+            remaining = end - start + 1
+            while remaining > 0:
+                data = fileobj.read(min(self.block_size, remaining))
+                if not data:
+                    break
+                remaining -= len(data)
+                yield data
+
+    def close(self):
+        self.fileobj.close()
+
+
 class OutputBody(object):
-    def __init__(self, response, body, chunk_size=4096):
+    '''
+    Wraps the body of a :class:`Response <gimme.response.Response>` and
+    turns it into the iterable that is handed to the WSGI server.
+
+    Byte strings are passed on whole, as a single-element list, unless
+    ``chunk_size`` is set and the body is larger than that; it is then
+    sliced by offset, so each byte is copied once. Unicode bodies are
+    encoded with the response charset first. Files are handed to the
+    server's ``wsgi.file_wrapper``, which may use :func:`sendfile
+    <os.sendfile>`, or else read in blocks of :attr:`file_block_size` bytes.
+    Other iterable bodies (lists, generators) are passed on as they are.
+
+    :param response: The response the body belongs to.
+    :param body: The body.
+    :param int chunk_size: The size of the pieces to split string bodies
+        into, or ``None`` not to split them.
+    '''
+    file_block_size = 65536
+
+    def __init__(self, response, body, chunk_size=None):
         self.response = response
         self.body = body
         self.chunk_size = chunk_size
 
+        # (body, charset, encoded body), see _encode()
+        self._encoded = (None, None, None)
+
     @property
     def body_iterable(self):
         return hasattr(self.body, '__iter__') or (
             isinstance(self.body, types.GeneratorType))
 
     def __iter__(self):
-        if self.body_iterable:
-            return iter(self.body)
-        elif isinstance(self.body, str):
-            return self._make_iter()
-        else:
-            return self._make_iter(True)
-
-    def _make_iter(self, convert_to_string=False):
-        try:
-            data = self.body if not convert_to_string else unicode(self.body,
-                self.response.charset, 'ignore')
-        except TypeError:
-            data = self.body
-        chunk = data[0:self.chunk_size]
-        while chunk:
-            if convert_to_string:
-                yield chunk.encode(self.response.charset, 'ignore')
+        return iter(self.get_iterable())
+
+    def get_iterable(self, environ=None):
+        '''
+        Returns the iterable to hand to the WSGI server.
+
+        :param environ: The WSGI environ dict, used to look up
+            ``wsgi.file_wrapper``.
+        '''
+        body = self.body
+
+        if hasattr(body, 'read') and not isinstance(body, basestring):
+            block_size = self.chunk_size or self.file_block_size
+            file_wrapper = environ and environ.get('wsgi.file_wrapper')
+            if file_wrapper:
+                return file_wrapper(body, block_size)
+            return FileIterator(body, block_size)
+        elif self.body_iterable:
+            return body
+        elif not isinstance(body, str):
+            body = self._encode(body)
+
+        if self.chunk_size and len(body) > self.chunk_size:
+            return self._make_iter(body)
+        return [body]
+
+    @property
+    def length(self):
+        '''
+        The length of the body in bytes, or ``None`` if it can't be known
+        without consuming the body (generators, for example). String bodies
+        are measured directly and files with :func:`os.fstat`.
+        '''
+        body = self.body
+
+        if isinstance(body, str):
+            return len(body)
+        elif isinstance(body, (list, tuple)):
+            if all(isinstance(i, str) for i in body):
+                return sum(len(i) for i in body)
+            return None
+        elif hasattr(body, 'fileno'):
+            try:
+                return os.fstat(body.fileno()).st_size - body.tell()
+            except (AttributeError, IOError, OSError, ValueError):
+                return None
+        elif self.body_iterable:
+            return None
+        return len(self._encode(body))
+
+    def _encode(self, body):
+        cached, charset, encoded = self._encoded
+        if cached is not body or charset != self.response.charset:
+            charset = self.response.charset
+            if body is None:
+                text = u''
             else:
-                yield chunk
-            data = data[self.chunk_size:]
-            chunk = data[0:self.chunk_size]
-        raise StopIteration
+                text = body if isinstance(body, unicode) else unicode(body)
+            encoded = text.encode(charset, 'ignore')
+            self._encoded = (body, charset, encoded)
+        return encoded
+
+    def _make_iter(self, data):
+        size = self.chunk_size
+        for offset in xrange(0, len(data), size):
+            yield data[offset:offset + size]
+
+    def close(self):
+        '''
+        Closes the body if it can be closed, as WSGI servers do with the
+        iterable they were given once it has been sent.
+        '''
+        if hasattr(self.body, 'close'):
+            self.body.close()
 
     def __repr__(self):
         return "<OutputBody()>"
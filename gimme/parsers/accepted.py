@@ -1,9 +1,11 @@
 import re
+from ..cache import LRUCache
 
 
 class AcceptedParser(object):
     _pattern = re.compile('(?P<value>[^;]+)(?:\s*;\s*q\s*=\s*'
         '(?P<priority>[0-9]*\.?[0-9]*))?')
+    _frozen = False
 
     def __init__(self, data, value_parser=None):
         self._data = data
@@ -25,6 +27,21 @@ class AcceptedParser(object):
             if temp['priority'] is not None else 1
         )
 
+    def __setattr__(self, key, value):
+        if self._frozen:
+            raise TypeError("Interned accepted values cannot be modified.")
+        object.__setattr__(self, key, value)
+
+    def freeze(self):
+        '''
+        Makes this value, and its parsed ``value`` if that supports it,
+        read-only.
+        '''
+        if hasattr(self.value, 'freeze'):
+            self.value.freeze()
+        object.__setattr__(self, '_frozen', True)
+        return self
+
     def __eq__(self, other):
         if isinstance(other, AcceptedParser):
             return self.value == other.value
@@ -50,6 +67,9 @@ class AcceptedParser(object):
 class AcceptedList(list):
     _separator = re.compile('\s*,\s*')
 
+    # (header, value_parser) -> FrozenAcceptedList, see intern()
+    _cache = LRUCache(512)
+
     def __repr__(self):
         return '<AcceptedList(%s)>' % ', '.join(map(str, self))
 
@@ -83,3 +103,47 @@ class AcceptedList(list):
             except ValueError:
                 continue
         return cls(result)
+
+    @classmethod
+    def intern(cls, data, value_parser=None):
+        '''
+        Like :meth:`parse`, but returns a shared :class:`FrozenAcceptedList`
+        from a process-wide cache of recently seen headers. Clients send few
+        distinct "Accept" headers, so this is usually a single lookup.
+
+        :param str data: The raw header value.
+        :param value_parser: A callable that each value is passed through,
+            such as :class:`ContentType
+            <gimme.parsers.contenttype.ContentType>`.
+        '''
+        key = (data, value_parser)
+        result = cls._cache.get(key)
+
+        if result is None:
+            result = FrozenAcceptedList(i.freeze() for i in
+                cls.parse(data, value_parser))
+            result.get_by_priority()
+            cls._cache.set(key, result)
+        return result
+
+
+class FrozenAcceptedList(AcceptedList):
+    '''
+    An :class:`AcceptedList` that can't be modified, since it is shared
+    between requests by :meth:`AcceptedList.intern`. The values it is
+    created with are frozen by ``intern()``. Its priority-sorted form is
+    computed once.
+    '''
+    def _immutable(self, *args, **kwargs):
+        raise TypeError("Interned AcceptedList objects cannot be modified.")
+
+    append = extend = insert = remove = pop = reverse = sort = _immutable
+    __setitem__ = __delitem__ = __setslice__ = __delslice__ = _immutable
+    __iadd__ = __imul__ = _immutable
+
+    def get_by_priority(self):
+        try:
+            return self._by_priority
+        except AttributeError:
+            self._by_priority = AcceptedList.get_by_priority(self)
+            return self._by_priority
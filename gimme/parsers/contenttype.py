@@ -1,51 +1,69 @@
 import re
+from ..cache import LRUCache
 
 
 class ContentType(object):
-    _pattern = re.compile('(?:(?P<category>[a-zA-Z0-9_\-]+|\*)/)?(?P<type>[a-zA-Z0-9_\-]+|\*)(?:;\s*charset=)?(?P<charset>[a-zA-Z0-9_\-]+)?')
+    _pattern = re.compile('(?:(?P<category>[a-zA-Z0-9_\-]+|\*)/)?(?P<type>[a-zA-Z0-9_\-]+|\*)(?:;\s*charset=)?(?P<charset>[a-zA-Z0-9_\-]+)?(?:;\s*boundary=(?P<boundary>[^\s;]+))?')
+
+    # Raw value -> (category, type, charset, boundary), see _parse()
+    _cache = LRUCache(1024)
+
+    _frozen = False
 
     def __init__(self, content_type, use_encoding=False):
         self._content_type = content_type
         self._use_encoding = use_encoding
         self.charset = 'utf-8'
+        self.boundary = None
         self.set(content_type)
 
-    def set(self, content_type):
-        self._match = self._pattern.search(content_type)
+    def __setattr__(self, key, value):
+        if self._frozen:
+            raise TypeError("Frozen content types cannot be modified.")
+        object.__setattr__(self, key, value)
 
-        if not self._match:
-            self._category = ''
-            self._type = ''
-            self.charset = 'utf-8'
+    def freeze(self):
+        object.__setattr__(self, '_frozen', True)
+        return self
 
-        else:
-            self._groups = self._match.groupdict()
+    @classmethod
+    def _parse(cls, content_type):
+        parsed = cls._cache.get(content_type)
 
-            # Some helpers to make accessing data easier
-            self._category = self._groups['category']
-            self._type = self._groups['type']
-            if self._groups['charset']:
-                self.charset = self._groups['charset']
+        if parsed is None:
+            match = cls._pattern.search(content_type)
+            if not match:
+                parsed = ('', '', 'utf-8', None)
+            else:
+                parsed = match.group('category', 'type', 'charset',
+                    'boundary')
+            cls._cache.set(content_type, parsed)
+        return parsed
+
+    def set(self, content_type):
+        self._category, self._type, charset, self.boundary = self._parse(
+            content_type)
+        if charset:
+            self.charset = charset
 
     def get(self):
         return str(self)
 
     def __eq__(self, other):
-        if not isinstance(other, ContentType):
-            try:
-                other = ContentType(other)
-            except ValueError:
-                return False
-
-        if other._category is None or self._category is None:
-            return (other._type == self._type
-                or other._type == '*'
+        if isinstance(other, ContentType):
+            category, type_ = other._category, other._type
+        else:
+            category, type_ = self._parse(other)[:2]
+
+        if category is None or self._category is None:
+            return (type_ == self._type
+                or type_ == '*'
                 or self._type == '*')
-        elif (other._category == self._category
+        elif (category == self._category
                 or self._category == '*'
-                or other._category == '*'):
-            if (other._type == '*' or self._type == '*') or (
-                    other._type == self._type):
+                or category == '*'):
+            if (type_ == '*' or self._type == '*') or (
+                    type_ == self._type):
                 return True
         return False
 
@@ -64,6 +82,9 @@ class ContentType(object):
     def __str__(self):
         if self._category is None:
             return self._type
+        elif self.boundary:
+            return '%s/%s; boundary=%s' % (self._category, self._type,
+                self.boundary)
         elif self._use_encoding:
             return '%s/%s; charset=%s' % (self._category, self._type,
                 self.charset)
@@ -0,0 +1,83 @@
+import re
+
+
+class RangeHeader(object):
+    '''
+    A parsed HTTP "Range" header. Only byte ranges are supported.
+
+    :param ranges: A list of ``(first, last)`` tuples, as written in the
+        header: ``last`` is ``None`` for open ranges (``500-``) and
+        ``first`` is ``None`` for suffix ranges (``-500``).
+    '''
+    _pattern = re.compile('^\s*bytes\s*=(.*)$', re.I)
+    _spec = re.compile('^\s*([0-9]*)\s*-\s*([0-9]*)\s*$')
+
+    # More ranges than this and the header is ignored
+    max_ranges = 16
+
+    def __init__(self, ranges):
+        self.ranges = ranges
+
+    def __repr__(self):
+        return "<RangeHeader(%s)>" % self.ranges
+
+    @classmethod
+    def parse(cls, value):
+        '''
+        Returns a ``RangeHeader``, or ``None`` if ``value`` is invalid, isn't
+        a byte range or asks for too many ranges. Invalid headers are to be
+        ignored.
+
+        :param str value: The raw header value.
+        '''
+        match = cls._pattern.match(value)
+        if not match:
+            return None
+
+        ranges = []
+        for spec in match.group(1).split(','):
+            if not spec.strip():
+                continue
+
+            spec_match = cls._spec.match(spec)
+            if not spec_match:
+                return None
+
+            first, last = spec_match.groups()
+            if not first and not last:
+                return None
+
+            first = int(first) if first else None
+            last = int(last) if last else None
+            if first is not None and last is not None and last < first:
+                return None
+            ranges.append((first, last))
+
+        if not ranges or len(ranges) > cls.max_ranges:
+            return None
+        return cls(ranges)
+
+    def resolve(self, length):
+        '''
+        Returns a list of ``(start, end)`` tuples of inclusive offsets for
+        the ranges that can be satisfied for a body of ``length`` bytes.
+        An empty list means that none can.
+
+        :param int length: The length of the body.
+        '''
+        result = []
+
+        for first, last in self.ranges:
+            if first is None:
+                if not last or not length:
+                    continue
+                start = max(0, length - last)
+                end = length - 1
+            else:
+                if first >= length:
+                    continue
+                start = first
+                end = length - 1 if last is None else min(last, length - 1)
+            result.append((start, end))
+
+        return result
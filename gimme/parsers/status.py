@@ -1,4 +1,5 @@
 import re
+from ..cache import LRUCache
 
 
 class StatusCode(object):
@@ -73,6 +74,13 @@ class StatusCode(object):
         522: 'Connection Timed Out'
     }
 
+    # Code -> status line, rendered once for every code above
+    _status_lines = dict((code, '%s %s' % (code, text))
+        for code, text in _status_code_map.iteritems())
+
+    # Status line -> code, see _parse()
+    _cache = LRUCache(256)
+
     def __init__(self, status='200 OK'):
         self._status = '200 OK'
         self.set(status)
@@ -84,31 +92,46 @@ class StatusCode(object):
         return "<StatusCode(%s)>" % self.get()
 
     def __eq__(self, other):
-        cls = type(self)
-        if not isinstance(other, cls):
-            other = cls(other)
-        return self.code == other.code
+        if isinstance(other, StatusCode):
+            return self._code == other._code
+        elif isinstance(other, int):
+            return self._code == other
+        return self._code == self._parse(other)
 
     def __ne__(self, other):
         return not self.__eq__(other)
 
     def __int__(self):
-        return self.code
+        return self._code
+
+    @classmethod
+    def _parse(cls, value):
+        code = cls._cache.get(value)
+
+        if code is None:
+            match = cls._pattern.match(value)
+            if not match:
+                raise ValueError("Invalid status code: %s" % value)
+            code = int(match.group(1))
+            cls._cache.set(value, code)
+        return code
 
     def set(self, value):
-        if isinstance(value, int):
-            self._status = "%s %s" % (value, self._status_code_map[value])
-        elif self._pattern.match(value):
-            self._status = value
+        if isinstance(value, StatusCode):
+            self._code, self._status = value._code, value._status
+        elif isinstance(value, int):
+            self._status = self._status_lines[value]
+            self._code = value
         else:
-            raise ValueError("Invalid status code: %s" % value)
+            self._code = self._parse(value)
+            self._status = value
 
     def get(self):
         return self._status
 
     @property
     def code(self):
-        return int(self._status.split(None, 1)[0])
+        return self._code
 
     @property
     def text(self):
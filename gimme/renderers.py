@@ -2,6 +2,7 @@ import types
 from json import dumps as dump_json
 from collections import namedtuple
 from .parsers.contenttype import ContentType
+from .cache import LRUCache
 import errors
 import zlib
 
@@ -28,10 +29,23 @@ class BulkRenderer(list, BaseRenderer):
 
 
 class Format(list, BaseRenderer):
+    '''
+    Picks one of several renderers based on the HTTP "Accept" header. The
+    renderer chosen for each distinct header value is remembered in
+    :attr:`cache`, so negotiating costs a lookup on most requests.
+
+    .. attribute:: cache
+
+        A :class:`LRUCache <gimme.cache.LRUCache>` of "Accept" header values
+        and the renderer chosen for them.
+    '''
+    cache_size = 64
+
     def __init__(self, renderer, content_type='*/*'):
         if not isinstance(content_type, ContentType):
             content_type = ContentType(content_type)
         self.append(nt_format(renderer, content_type))
+        self.cache = LRUCache(self.cache_size)
 
     def __or__(self, other):
         if isinstance(other, Format):
@@ -39,6 +53,7 @@ class Format(list, BaseRenderer):
                 self.append(nt_format(i.renderer, i.content_type))
         else:
             self.append(nt_format(other[0], other[1]))
+        self.cache.clear()
         return self
 
     def __repr__(self):
@@ -51,21 +66,43 @@ class Format(list, BaseRenderer):
             result.append(i.content_type)
         return result
 
+    @property
+    def hit_rate(self):
+        '''
+        The fraction of renders that reused a cached negotiation.
+        '''
+        return self.cache.hit_rate
+
     def get_by_content_type(self, content_type):
         for i in self:
             if i.content_type == content_type:
                 return i.renderer
         raise IndexError("Could not find content_type: %s" % content_type)
 
-    def render(self, controller, data, request, response):
-        content_types = self.content_types
-        try:
-            priority = (request.accepted.filter(content_types)
-                .get_highest_priority()).value
-        except IndexError:
-            priority = self[0].content_type
-        renderer = self.get_by_content_type(priority)
+    def negotiate(self, request):
+        '''
+        Returns the renderer that best matches the "Accept" header of
+        ``request``.
+
+        :param request: An instance of :class:`Request
+            <gimme.request.Request>`.
+        '''
+        key = request.headers.get('accept', '')
+        renderer = self.cache.get(key)
+
+        if renderer is None:
+            try:
+                priority = (request.accepted.filter(self.content_types)
+                    .get_highest_priority()).value
+            except IndexError:
+                priority = self[0].content_type
+            renderer = self.get_by_content_type(priority)
+            self.cache.set(key, renderer)
 
+        return renderer
+
+    def render(self, controller, data, request, response):
+        renderer = self.negotiate(request)
         return renderer.render(controller, data, request, response)
 
 
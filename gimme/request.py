@@ -7,20 +7,44 @@ from .parsers.contenttype import ContentType
 from .parsers.accepted import AcceptedList
 
 
+class lazy_attribute(object):
+    '''
+    Computes an attribute on first access and stores the result on the
+    instance, so later reads are plain attribute lookups. The attribute can
+    still be assigned to.
+    '''
+    def __init__(self, fn):
+        self.fn = fn
+        self.__name__ = fn.__name__
+        self.__doc__ = fn.__doc__
+
+    def __get__(self, instance, owner):
+        if instance is None:
+            return self
+        value = instance.__dict__[self.__name__] = self.fn(instance)
+        return value
+
+
 class Request(object):
     '''
     The Request class is responsible for parsing the request headers and body
     into Pythonic shindigs that are (supposed to be) very easy to work with.
 
+    Nothing is parsed up front: the query string and the "Accept",
+    "Accept-Language", "Accept-Charset" and "Content-Type" headers are
+    parsed the first time the matching attribute is read.
+
     :ivar app: The Gimme application.
     :ivar environ: The WSGI environ dict.
-    :ivar headers: The request headers (an instance of :class:`gimme.headers.RequestHeaders`).
+    :ivar headers: The request headers (a read-only view of ``environ``; an
+        instance of :class:`gimme.headers.RequestHeaders`).
     :ivar wsgi: The WSGI headers. Also an instance of :class:`gimme.headers.RequestHeaders`.
     :ivar params: A :class:`gimme.dotdict.DotDict` of the parameters from the
         route URI.
     :ivar query: The query string in a dictionary-like object.
     :ivar accepted: A handy parsing of the HTTP "Accept" header. An instance
-        of :class:`gimme.parsers.accepted.AcceptedList`.
+        of :class:`gimme.parsers.accepted.AcceptedList` that is shared with
+        other requests sending the same header and can't be modified.
     :ivar accepted_languages: A handy parsing of the HTTP "Accept-Language"
         header. An instance of :class:`gimme.parsers.accepted.AcceptedList`.
     :ivar accepted_charsets: A handy parsing of the HTTP "Accept-Charset"
@@ -38,37 +62,35 @@ class Request(object):
 
     def __init__(self, environ, params=None):
         self.environ = environ
-        self.headers = RequestHeaders()
-        self.wsgi = RequestHeaders()
+        self.headers = RequestHeaders(environ)
+        self.wsgi = RequestHeaders(environ, wsgi=True)
         self.params = params or DotDict()
         self.__raw_body = None
 
-        self._populate_headers(environ)
+    @lazy_attribute
+    def query(self):
+        return QueryString(self.headers.get('query_string', ''))
 
-        self.query = QueryString(self.headers.get('query_string', ''))
+    @lazy_attribute
+    def accepted(self):
+        return AcceptedList.intern(self.headers.get('accept', ''), ContentType)
 
-        self.accepted = AcceptedList.parse(
-            self.headers.get('accept', ''), ContentType)
+    @lazy_attribute
+    def accepted_languages(self):
+        return AcceptedList.intern(self.headers.get('accept_language', ''))
 
-        self.accepted_languages = AcceptedList.parse(
-            self.headers.get('accept_language', ''))
+    @lazy_attribute
+    def accepted_charsets(self):
+        return AcceptedList.intern(self.headers.get('accept_charset', ''))
 
-        self.accepted_charsets = AcceptedList.parse(
-            self.headers.get('accept_charset', ''))
+    @lazy_attribute
+    def cookies(self):
+        return self.headers.get('cookie', '')
 
-        self.cookies = self.headers.get('cookie', '')
-        self.type = (ContentType(self.headers.content_type) if 'content_type'
-            in self.headers else None)
-
-    def _populate_headers(self, environ):
-        for k, v in environ.iteritems():
-            key = k.lower()
-            if key.startswith('http_'):
-                self.headers[key[5:]] = v
-            elif key.startswith('wsgi.'):
-                self.wsgi[key[5:]] = v
-            else:
-                self.headers[key] = v
+    @lazy_attribute
+    def type(self):
+        content_type = self.headers.get('content_type')
+        return ContentType(content_type) if content_type is not None else None
 
     def get(self, key):
         '''
@@ -153,8 +175,16 @@ class Request(object):
 
         *Note: Strips any port off of the header.*
         '''
-        raw_host = self.headers.get('host', '')
-        return self._host_pattern.match(raw_host).group(1)
+        return self.parse_host(self.headers.get('host', ''))
+
+    @classmethod
+    def parse_host(cls, raw_host):
+        '''
+        Strips the port off of a "Host" header value.
+
+        :param str raw_host: The header value.
+        '''
+        return cls._host_pattern.match(raw_host).group(1)
 
     @property
     def subdomains(self):
@@ -4,6 +4,7 @@ import datetime
 import mimetypes
 import re
 import sys
+import uuid
 
 try:
     from contextlib import nested
@@ -15,7 +16,8 @@ from .headers import ResponseHeaders, Header
 from .controller import ErrorController
 from .parsers.status import StatusCode
 from .parsers.contenttype import ContentType
-from .output import OutputBody
+from .parsers.range import RangeHeader
+from .output import OutputBody, FileRangeIterator
 import gimme.errors
 
 
@@ -37,6 +39,9 @@ class Response(Exception):
     '''
 
     _charset_pattern = re.compile('(.*?); charset=(.*)$')
+
+    # Statuses whose responses never carry a Content-Length
+    _no_body_codes = frozenset([100, 101, 102, 204, 304])
     mimetypes.init()
 
     def __init__(self, status=200, headers=None, body=''):
@@ -68,6 +73,18 @@ class Response(Exception):
     def body(self, value):
         self._body.set(value)
 
+    @property
+    def chunk_size(self):
+        '''
+        The size of the pieces that a string body is sent in. Defaults to
+        ``None``, which sends it in one piece.
+        '''
+        return self._body.chunk_size
+
+    @chunk_size.setter
+    def chunk_size(self, value):
+        self._body.chunk_size = value
+
     @property
     def status(self):
         '''
@@ -252,10 +269,115 @@ class Response(Exception):
 
     links = property(None, links, None, links.__doc__)
 
+    def apply_range(self, request):
+        '''
+        Turns a ``200 OK`` response whose body is a file into a
+        ``206 Partial Content`` response if ``request`` has a satisfiable
+        "Range" header (and an "If-Range" header that still matches, if
+        any). Several ranges are sent as ``multipart/byteranges``, and
+        unsatisfiable ranges get ``416``. Ranges are read straight from
+        their offsets in the file. Every such response advertises
+        "Accept-Ranges".
+
+        This is called by the WSGI adapter before the headers are sent.
+
+        :param request: The :class:`Request <gimme.request.Request>`.
+        '''
+        body = self._body.body
+        if (self._status.code != 200 or not hasattr(body, 'seek') or
+                request.headers.get('request_method') not in ('GET', 'HEAD')):
+            return
+
+        length = self._body.length
+        if length is None:
+            return
+        self.headers['Accept-Ranges'] = 'bytes'
+
+        header = request.headers.get('range')
+        if header is None or not self._if_range(request):
+            return
+
+        byte_range = RangeHeader.parse(header)
+        if byte_range is None:
+            return
+
+        ranges = byte_range.resolve(length)
+        if not ranges:
+            self._body.close()
+            self.status = 416
+            self.headers['Content-Range'] = 'bytes */%d' % length
+            self.headers['Content-Length'] = '0'
+            self.body = ''
+            return
+
+        self.status = 206
+        offset = body.tell()
+
+        if len(ranges) == 1:
+            start, end = ranges[0]
+            self.headers['Content-Range'] = 'bytes %d-%d/%d' % (start, end,
+                length)
+            self.headers['Content-Length'] = str(end - start + 1)
+
+            # A range that runs to the end of the file can still go through
+            # wsgi.file_wrapper.
+            if end == length - 1:
+                body.seek(offset + start)
+            else:
+                self.body = FileRangeIterator(body,
+                    [(offset + start, offset + end)])
+            return
+
+        boundary = uuid.uuid4().hex
+        content_type = str(self._type)
+        segments = []
+        total = 0
+
+        for start, end in ranges:
+            part = ('--%s\r\nContent-Type: %s\r\nContent-Range: '
+                'bytes %d-%d/%d\r\n\r\n' % (boundary, content_type, start,
+                end, length))
+            segments.extend([part, (offset + start, offset + end), '\r\n'])
+            total += len(part) + end - start + 1 + 2
+
+        segments.append('--%s--\r\n' % boundary)
+        total += len(segments[-1])
+
+        self.type = 'multipart/byteranges; boundary=%s' % boundary
+        self.headers['Content-Length'] = str(total)
+        self.body = FileRangeIterator(body, segments)
+
+    def _if_range(self, request):
+        if_range = request.headers.get('if_range')
+        if if_range is None:
+            return True
+
+        if_range = if_range.strip()
+        if if_range.startswith('"') or if_range.startswith('W/'):
+            # Weak validators never match
+            etag = self.headers.get('ETag')
+            return etag is not None and etag.value == if_range and (
+                not if_range.startswith('W/'))
+
+        last_modified = self.headers.get('Last-Modified')
+        return last_modified is not None and last_modified.value == if_range
+
     def render(self, template, params):
         raise NotImplementedError("Response.render() not implemented!")
 
     def get_headers(self):
-        headers = ResponseHeaders(self.headers)
-        headers['Content-Type'] = str(self._type)
-        return headers.items()
+        '''
+        Returns the headers as the list of ``(key, value)`` tuples that WSGI
+        expects, with "Content-Type" taken from :attr:`type`. Unless it has
+        been set already, "Content-Length" is added if the length of the
+        body is known; otherwise the server falls back to chunked transfer
+        encoding or closing the connection.
+        '''
+        headers = self.headers.get_wsgi_headers(str(self._type))
+
+        if (self._status.code not in self._no_body_codes and
+                'Content-Length' not in self.headers):
+            length = self._body.length
+            if length is not None:
+                headers.append(('Content-Length', str(length)))
+        return headers
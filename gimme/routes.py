@@ -1,9 +1,13 @@
 import re
+import uuid
 from . import errors
 from .request import Request
 from .response import Response
 from .dotdict import DotDict
 from .controller import ErrorController
+from .dispatchers import TreeDispatcher
+from .cache import LRUCache
+from .static import StaticFiles
 
 
 class PatternMatch(object):
@@ -15,6 +19,24 @@ class PatternMatch(object):
         return "<PatternMatch(%s, %s)>" % (self.pattern, self.match)
 
 
+class ParamsMatch(object):
+    '''
+    Stands in for a regex match object when a dispatcher has resolved the
+    route parameters without running the route's regex. Only
+    ``groupdict()`` is provided, since that is all Gimme uses.
+
+    :param params: A dict of parameter names to values.
+    '''
+    def __init__(self, params):
+        self._params = params
+
+    def __repr__(self):
+        return "<ParamsMatch(%s)>" % self._params
+
+    def groupdict(self):
+        return dict(self._params)
+
+
 class RouteList(list):
     '''
     A subclass of :func:`list` that maintains the same general interface of
@@ -75,20 +97,73 @@ class Route(object):
     '''
     A common interface for creating and matching route patterns.
 
+    Parameters may be given a type, such as ``/users/:id<int>`` or
+    ``/files/:key<uuid>``. A typed parameter only matches values of that
+    type and is converted before it reaches ``request.params``; URIs that
+    don't conform fall through to the next route. The available types are
+    the keys of :attr:`param_types`.
+
     :param regex: Either a string with optional URI parameters (such as
         ``/somewhere`` or ``/somewhere/:param1``), or a regex as created with
         :func:`re.compile`. 
+
+    .. attribute:: param_types
+
+        A dict of type name to a tuple of the regex that values of the type
+        must match and a callable that converts them (or ``None`` to leave
+        them as strings). New types can be added to it before routes that
+        use them are created.
+
+    .. attribute:: segments
+
+        The parsed path segments of a string pattern, as used by
+        :class:`TreeDispatcher <gimme.dispatchers.TreeDispatcher>`. Each
+        segment is a ``(kind, value, optional, validator)`` tuple, where
+        ``kind`` is one of ``static``, ``param`` or ``last`` (a trailing
+        parameter) and ``validator`` is a regex that typed parameter values
+        must match. ``None`` if the route can only be matched by its regex.
+
+    .. attribute:: wildcard
+
+        Whether or not the route is the ``*`` catch-all.
+
+    .. attribute:: static_path
+
+        The URI the route matches if the pattern has no parameters (such
+        as ``/about``); otherwise ``None``.
     '''
-    __sub_pattern = re.compile(':([a-zA-Z_\-0-9]+)(\?)?')
-    __sub_last_pattern = re.compile('\/:([a-zA-Z_\-0-9]+)(\?)?$')
+    param_types = {
+        'str': ('[a-zA-Z0-9_\-\.,]+', None),
+        'int': ('[0-9]+', int),
+        'float': ('[0-9]+(?:\.[0-9]+)?', float),
+        'uuid': ('[0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-'
+            '[0-9a-fA-F]{4}-[0-9a-fA-F]{12}', uuid.UUID)
+    }
+
+    __sub_pattern = re.compile(':([a-zA-Z_\-0-9]+)(?:<([a-zA-Z_]+)>)?(\?)?')
+    __sub_last_pattern = re.compile(
+        '\/:([a-zA-Z_\-0-9]+)(?:<([a-zA-Z_]+)>)?(\?)?$')
+    __param_segment = re.compile(
+        '^:([a-zA-Z_\-0-9]+)(?:<([a-zA-Z_]+)>)?(\?)?$')
+    __static_segment = re.compile('^[^\\\\^$*+?{}\[\]()|:<>]*$')
+    _validators = {}
 
     def __init__(self, regex, priority=10):
         self.priority = priority
+        self.wildcard = regex == '*'
+        self._converters = {}
         
         if isinstance(regex, str):
             self._regex = self._make_regex(regex)
+            self.segments = self._make_segments(regex)
         else:
             self._regex = regex
+            self.segments = None
+
+        if self.segments and all(i[0] == 'static' for i in self.segments):
+            self.static_path = regex
+        else:
+            self.static_path = None
  
     def __gt__(self, other):
         return self.priority > other.priority
@@ -99,6 +174,13 @@ class Route(object):
     def __eq__(self, other):
         return self.priority == other.priority and self._regex == other._regex
 
+    @property
+    def regex(self):
+        '''
+        The compiled regex for the route.
+        '''
+        return self._regex
+
     def __repr__(self):
         return "<Route(%s, priority=%s)>" % (self._regex.pattern,
             self.priority)
@@ -115,26 +197,91 @@ class Route(object):
             no match.
         '''
         match = self._regex.match(uri)
-        return PatternMatch(self, match) if match else None
+        if not match:
+            return None
+        elif self._converters:
+            return self.make_match(match.groupdict())
+        return PatternMatch(self, match)
+
+    def make_match(self, params):
+        '''
+        Creates a :class:`PatternMatch <gimme.routes.PatternMatch>` for
+        parameters that were resolved without running the regex. Typed
+        parameters are converted; if one can't be, ``None`` is returned.
+
+        :param dict params: The route parameters, exactly as
+            ``groupdict()`` on the regex match would have returned them.
+        '''
+        for name, converter in self._converters.iteritems():
+            if params.get(name) is not None:
+                try:
+                    params[name] = converter(params[name])
+                except (ValueError, OverflowError):
+                    return None
+        return PatternMatch(self, ParamsMatch(params))
+
+    def _get_param_type(self, name, type_name):
+        try:
+            pattern, converter = self.param_types[type_name or 'str']
+        except KeyError:
+            raise errors.RouteError("Unknown parameter type: %s" % type_name)
+
+        if converter:
+            self._converters[name] = converter
+        return pattern
 
     def _make_regex(self, string):
         if string == '*':
             return re.compile('.*')
 
         def handle_replace(match):
-            return '(?P<%s>[a-zA-Z0-9_\-\.,]+)%s' % (match.group(1),
-                match.group(2) or '')
+            return '(?P<%s>%s)%s' % (match.group(1),
+                self._get_param_type(match.group(1), match.group(2)),
+                match.group(3) or '')
 
         def handle_last_replace(match):
-            return ('(?P<__last>/)?(?(__last)(?P<{0}>[a-zA-Z0-9_\-\.,]+){1})'
+            return ('(?P<__last>/)?(?(__last)(?P<{0}>{1}){2})'
                 '(/)?').format(
                 match.group(1),
-                match.group(2) or '')
+                self._get_param_type(match.group(1), match.group(2)),
+                match.group(3) or '')
 
         pattern = self.__sub_last_pattern.sub(handle_last_replace, string)
         pattern = '^%s$' % self.__sub_pattern.sub(handle_replace, pattern)
         return re.compile(pattern)
 
+    def _make_segments(self, string):
+        if self.wildcard:
+            return None
+
+        parts = string.split('/')
+        segments = []
+
+        for i, part in enumerate(parts):
+            param = self.__param_segment.match(part)
+            if param:
+                kind = 'last' if 0 < i == len(parts) - 1 else 'param'
+                validator = None
+                if param.group(2):
+                    validator = self._get_validator(param.group(2))
+                segments.append((kind, param.group(1), bool(param.group(3)),
+                    validator))
+            elif self.__static_segment.match(part):
+                segments.append(('static', part, False, None))
+            else:
+                return None
+
+        return segments
+
+    @classmethod
+    def _get_validator(cls, type_name):
+        try:
+            return cls._validators[type_name]
+        except KeyError:
+            validator = re.compile('^(?:%s)$' % cls.param_types[type_name][0])
+            cls._validators[type_name] = validator
+            return validator
+
     def __or__(self, other):
         '''
         Create a :class:`RouteList <gimme.routes.RouteList>` object with
@@ -181,6 +328,10 @@ class RouteMapping(object):
         self.controller = controller
         self.method = method
         self.match_fn = match_fn
+
+        # The application middleware followed by ``middleware``; set when
+        # the routes are frozen so it isn't rebuilt for every request.
+        self.resolved_middleware = None
         
     def __gt__(self, other):
         return self.pattern > other.pattern
@@ -234,6 +385,13 @@ class Routes(object):
     :param strip_trailing_slash: Whether or not trailing slashes should be
         stripped away pre-matching or not. If true, ``/somewhere/`` and
         ``/somewhere`` are equivalent.
+    :param dispatcher: The :class:`BaseDispatcher
+        <gimme.dispatchers.BaseDispatcher>` subclass used to resolve URIs
+        against each route list. Defaults to :class:`TreeDispatcher
+        <gimme.dispatchers.TreeDispatcher>`.
+    :param int cache_size: If set, the number of ``(REQUEST_METHOD, URI)``
+        lookups to remember in :attr:`cache`. Lookups that could depend on
+        a ``match_fn`` are never cached.
 
     .. attribute:: http404
 
@@ -245,27 +403,79 @@ class Routes(object):
         A :class:`RouteMapping <gimme.routes.RouteMapping>` pointing to
         :meth:`ErrorController.http500 <gimme.controller.ErrorController.http500>`
 
+    .. attribute:: http405
+
+        A :class:`RouteMapping <gimme.routes.RouteMapping>` pointing to
+        :meth:`ErrorController.http405 <gimme.controller.ErrorController.http405>`.
+        Used when the URI matches routes, but none for the request method;
+        the response carries an ``Allow`` header.
+
+    .. attribute:: options
+
+        A :class:`RouteMapping <gimme.routes.RouteMapping>` used to answer
+        ``OPTIONS`` requests with an ``Allow`` header and an empty body.
+
+    .. attribute:: cache
+
+        A :class:`LRUCache <gimme.cache.LRUCache>` of resolved routes and
+        their parameters if ``cache_size`` was given, otherwise ``None``.
+        Its ``hits`` and ``misses`` counters can be used to size it.
+
     '''
 
     def __init__(self, app, match_param='PATH_INFO',
-            strip_trailing_slash=True):
+            strip_trailing_slash=True, dispatcher=TreeDispatcher,
+            cache_size=None):
         self.app = app
         self.match_param = match_param
         self.strip_trailing_slash = strip_trailing_slash
+        self.dispatcher = dispatcher
+        self.cache = LRUCache(cache_size) if cache_size else None
+
+        # URI -> the request methods it allows; see _get_allowed()
+        self._allowed = LRUCache(256)
 
         self.__get = []
         self.__post = []
         self.__put = []
         self.__delete = []
         self.__all = []
-        
-        self._sorted = False
+
+        self._request_methods = ('GET', 'POST', 'PUT', 'DELETE')
+        self._route_lists = {
+            'GET': self.__get,
+            'POST': self.__post,
+            'PUT': self.__put,
+            'DELETE': self.__delete,
+            None: self.__all
+        }
+        self._dispatchers = {}
+        self._static = {}
+
+        # Route list name -> parameterized routes, in order; see
+        # _make_static()
+        self._dynamic = {}
+
+        # Host pattern -> Routes, see host()
+        self._hosts = {}
+
+        # (URI prefix, StaticFiles), longest prefix first; see static()
+        self._mounts = []
+
         self._controllers = {}
+        self.frozen = False
 
-        self.http404 = RouteMapping('*', [], ErrorController.http404, ErrorController(app))
-        self.http500 = RouteMapping('*', [], ErrorController.http500, ErrorController(app))
+        error_controller = ErrorController(app)
+        self.http404 = RouteMapping('*', [], ErrorController.http404, error_controller)
+        self.http500 = RouteMapping('*', [], ErrorController.http500, error_controller)
+        self.http405 = RouteMapping('*', [], ErrorController.http405, error_controller)
+        self.options = RouteMapping('*', [], ErrorController.options, error_controller)
 
     def _add(self, routes_list, pattern, *args, **kwargs):
+        if self.frozen:
+            raise errors.RouteError("Routes cannot be added once the app "
+                "has been frozen.")
+
         middleware = list(args[:-1])
         fn = kwargs.get('fn', None)
         try:
@@ -273,13 +483,133 @@ class Routes(object):
         except IndexError, e:
             raise errors.RouteError("No controller method specified.")
 
+        mapping = RouteMapping(pattern, middleware, method,
+            self._get_controller(method), fn)
+
+        # Kept sorted by priority as routes are added, so that matching is
+        # the same whether or not the routes have been frozen. Routes of
+        # equal priority keep the order in which they were added.
+        index = len(routes_list)
+        while index and (routes_list[index - 1].pattern.priority <
+                mapping.pattern.priority):
+            index -= 1
+        routes_list.insert(index, mapping)
+        self._reset()
+
+    def _get_controller(self, method):
         controller_cls = method.im_class if hasattr(method, 'im_class') else None
 
         if controller_cls and controller_cls not in self._controllers:
             self._controllers[controller_cls] = controller_cls(self.app)
-        
-        routes_list.append(RouteMapping(pattern, middleware, method,
-            self._controllers.get(controller_cls, None), fn))
+
+        return self._controllers.get(controller_cls, None)
+
+    def host(self, pattern):
+        '''
+        Returns the route table for requests whose "Host" header matches
+        ``pattern``, creating it the first time::
+
+            api = app.routes.host('api.example.com')
+            api.get('/users/:id', ApiController.user)
+
+        ``pattern`` is either a host name or a host name whose first label
+        is ``*``, which matches any subdomain (``*.example.com`` matches
+        ``www.example.com`` and ``a.b.example.com``, but not
+        ``example.com``). The port and case are ignored, and exact names
+        take precedence over wildcards.
+
+        Requests are matched against the table of their host first and then
+        against the routes that aren't tied to a host, so the host is looked
+        up once per request instead of with a ``match_fn`` on every route.
+
+        :param str pattern: The host name to route for.
+        :return: An instance of :class:`Routes <gimme.routes.Routes>`.
+        '''
+        pattern = pattern.lower()
+
+        if pattern not in self._hosts:
+            if self.frozen:
+                raise errors.RouteError("Routes cannot be added once the "
+                    "app has been frozen.")
+
+            table = Routes(self.app, self.match_param,
+                self.strip_trailing_slash, self.dispatcher,
+                self.cache.size if self.cache is not None else None)
+            table._controllers = self._controllers
+            self._hosts[pattern] = table
+
+        return self._hosts[pattern]
+
+    def static(self, uri, path, **kwargs):
+        '''
+        Serves the files of the local directory ``path`` under ``uri``::
+
+            app.routes.static('/assets', 'public/assets', cache_control=3600)
+
+        Mounts are looked up by prefix before any route, for ``GET`` and
+        ``HEAD`` requests only. A file that is found is sent straight away,
+        without the app's middleware or a controller, and a URI with no file
+        behind it falls through to the routes. Unlike :func:`static
+        <gimme.middleware.static>` middleware, this costs other requests
+        nothing.
+
+        Keyword arguments are passed on to :class:`StaticFiles
+        <gimme.static.StaticFiles>`.
+
+        :param str uri: The URI prefix to serve the files under.
+        :param str path: The local directory to serve.
+        :return: The :class:`StaticFiles <gimme.static.StaticFiles>`.
+        '''
+        if self.frozen:
+            raise errors.RouteError("Routes cannot be added once the app "
+                "has been frozen.")
+
+        files = StaticFiles(path, uri, **kwargs)
+        prefix = '/' + files.prefix + '/' if files.prefix else '/'
+        self._mounts.append((prefix, files))
+        self._mounts.sort(key=lambda mount: len(mount[0]), reverse=True)
+        return files
+
+    def serve_static(self, environ):
+        '''
+        Serves the request from a directory mounted with :meth:`static`, if
+        there is a file for it.
+
+        :return: A tuple of :class:`Request <gimme.request.Request>` and
+            :class:`Response <gimme.response.Response>` objects, or ``None``
+            if the request is for the routes.
+        '''
+        if not self._mounts and not self._hosts:
+            return None
+        if environ['REQUEST_METHOD'].upper() not in ('GET', 'HEAD'):
+            return None
+
+        uri = self._get_uri(environ)
+        table = self._get_host_table(environ) if self._hosts else None
+
+        for routes in (table, self):
+            if routes is None:
+                continue
+            for prefix, files in routes._mounts:
+                if (uri + '/').startswith(prefix):
+                    request = Request(environ, DotDict())
+                    response = Response(200, self.app.get_default_headers())
+                    if files.serve(request, response, uri):
+                        return (request, response)
+        return None
+
+    def _get_host_table(self, environ):
+        raw_host = environ.get('HTTP_HOST') or environ.get('SERVER_NAME', '')
+        host = Request.parse_host(raw_host).lower()
+
+        table = self._hosts.get(host)
+        if table is None:
+            labels = host.split('.')
+            for i in xrange(1, len(labels)):
+                table = self._hosts.get('*.' + '.'.join(labels[i:]))
+                if table is not None:
+                    break
+        return table
 
     def get(self, pattern, *args, **kwargs):
         '''
@@ -358,26 +688,177 @@ class Routes(object):
         '''
         self._add(self.__all, pattern, *args, **kwargs)
 
-    def _find_match(self, environ, match_list):
-        for i in match_list:
-            match = i.match(environ, self.match_param)
-            if match:
-                params = DotDict(match.match.groupdict())
-                default_headers = dict(self.app.get('default headers', []))
+    def _get_dispatcher(self, name):
+        try:
+            return self._dispatchers[name]
+        except KeyError:
+            dispatcher = self.dispatcher(self._route_lists[name])
+            self._dispatchers[name] = dispatcher
+            return dispatcher
 
-                request = Request(environ, params)
-                response = Response(200, default_headers)
+    def _get_allowed(self, environ, uri):
+        '''
+        Returns a sorted list of the request methods that ``uri`` can be
+        requested with; empty if there are none. Non-empty results are
+        remembered, so that repeated ``405`` and ``OPTIONS`` responses
+        don't look the URI up again for every method.
+        '''
+        cached = self._allowed.get(uri)
+        if cached is not None:
+            return cached
+
+        allowed = set(name for name in self._request_methods
+            if self._find_match(environ, uri, name))
+
+        if allowed:
+            if 'GET' in allowed:
+                allowed.add('HEAD')
+            allowed.add('OPTIONS')
+
+        allowed = sorted(allowed)
+        cacheable = all(self._get_dispatcher(name).cacheable()
+            for name in self._request_methods)
+        if allowed and cacheable:
+            self._allowed.set(uri, allowed)
+        return allowed
+
+    def _get_static(self, name):
+        try:
+            return self._static[name]
+        except KeyError:
+            static, dynamic = self._make_static(self._route_lists[name])
+            self._static[name] = static
+            self._dynamic[name] = dynamic
+            return static
+
+    def _make_static(self, mappings):
+        '''
+        Returns a dict of normalized URI to the ``(mapping, route, count)``
+        tuples with that static path, where ``count`` is the number of
+        parameterized routes before it. A route is only included if no
+        earlier parameterized route could match the normalized URI, so that
+        serving it straight from the dict gives the same result as the
+        dispatcher; URIs that differ from their normalized form are checked
+        against the earlier routes when they are matched. The list of
+        parameterized routes is returned as well.
+        '''
+        static = {}
+        dynamic = []
+
+        for mapping in mappings:
+            routes = mapping.pattern
+            if not isinstance(routes, list):
+                routes = [routes]
+
+            for route in routes:
+                if route.static_path is None:
+                    dynamic.append(route)
+                    continue
+
+                path = self._normalize(route.static_path)
+                if not any(i.match(path) for i in dynamic):
+                    static.setdefault(path, []).append((mapping, route,
+                        len(dynamic)))
+
+        return (static, dynamic)
+
+    def _reset(self):
+        self._dispatchers.clear()
+        self._static.clear()
+        self._dynamic.clear()
+        self._allowed.clear()
+        if self.cache is not None:
+            self.cache.clear()
+
+    def _get_uri(self, environ, context='SCRIPT_NAME'):
+        uri = environ.get(self.match_param, '')
+        script_name = environ.get(context, '')
 
-                return (request, response, i)
+        if uri.startswith(script_name):
+            uri = uri[len(script_name):]
+        return uri
+
+    def _normalize(self, uri):
+        if self.strip_trailing_slash and len(uri) > 1:
+            return uri.rstrip('/') or '/'
+        return uri
+
+    def _match_static(self, environ, uri, name):
+        # Only the static lookup is normalized; parameterized patterns
+        # decide for themselves whether a trailing slash is allowed.
+        path = self._normalize(uri)
+        candidates = self._get_static(name).get(path)
+        if not candidates:
+            return None
+
+        dynamic = self._dynamic[name]
+        for mapping, route, count in candidates:
+            # /:name/ registered before /health still gets /health/
+            if path != uri and any(i.match(uri) for i in dynamic[:count]):
+                return None
+            if not mapping.match_fn or mapping.match_fn(uri, environ):
+                return (mapping, route.make_match({}))
+        return None
 
-    def _sort(self):
-        if not self._sorted:
-            self.__get.sort(reverse=True)
-            self.__post.sort(reverse=True)
-            self.__put.sort(reverse=True)
-            self.__delete.sort(reverse=True)
-            self.__all.sort(reverse=True)
-            self._sorted = True
+    def _find_match(self, environ, uri, name):
+        return (self._match_static(environ, uri, name) or
+            self._get_dispatcher(name).match(uri, environ))
+
+    def _resolve(self, environ, uri, request_method):
+        '''
+        Returns a tuple of the matching :class:`RouteMapping
+        <gimme.routes.RouteMapping>` (or ``None``), its parameters and
+        whether or not the result may be cached.
+        '''
+        cacheable = True
+
+        if request_method in self._route_lists:
+            result = self._find_match(environ, uri, request_method)
+            dispatcher = self._get_dispatcher(request_method)
+            if result:
+                return (result[0], result[1].match.groupdict(),
+                    dispatcher.cacheable(result[0]))
+            cacheable = dispatcher.cacheable()
+
+        result = self._find_match(environ, uri, None)
+        if result:
+            dispatcher = self._get_dispatcher(None)
+            return (result[0], result[1].match.groupdict(),
+                cacheable and dispatcher.cacheable(result[0]))
+
+        return (None, None, False)
+
+    def freeze(self):
+        '''
+        Prepares the routes for serving: builds the lookup structures for
+        every route list, makes sure every controller is instantiated and
+        resolves the full middleware list of every route. Afterwards, adding
+        routes raises a :class:`RouteError <gimme.errors.RouteError>`.
+
+        This is called by :meth:`App.freeze <gimme.app.App.freeze>`.
+        '''
+        if self.frozen:
+            return
+
+        for name, mappings in self._route_lists.iteritems():
+            self._get_dispatcher(name)
+            self._get_static(name)
+
+            for mapping in mappings:
+                if mapping.controller is None:
+                    mapping.controller = self._get_controller(mapping.method)
+                mapping.resolved_middleware = (self.app.middleware +
+                    mapping.middleware)
+
+        for table in self._hosts.itervalues():
+            table.freeze()
+
+        for mapping in (self.http404, self.http500, self.http405,
+                self.options):
+            mapping.resolved_middleware = (self.app.middleware +
+                mapping.middleware)
+
+        self.frozen = True
 
     def match(self, environ):
         '''
@@ -387,6 +868,12 @@ class Routes(object):
         objects returned will resolve to the :attr:`Routes.http404
         <gimme.routes.Routes.http404>` attribute.
 
+        ``HEAD`` requests are matched against the ``GET`` routes. ``OPTIONS``
+        requests that no route handles resolve to :attr:`Routes.options
+        <gimme.routes.Routes.options>`, and a URI that only has routes for
+        other request methods resolves to :attr:`Routes.http405
+        <gimme.routes.Routes.http405>`.
+
         :param environ: A WSGI environ dictionary or something similar that
             can be used for matching. Should contain at least
             ``REQUEST_METHOD`` and whichever ``match_param`` was passed to the
@@ -395,26 +882,54 @@ class Routes(object):
         :return: A tuple of :class:`Request <gimme.request.Request>` and
             :class:`Response <gimme.response.Response>` objects.
         '''
-        request_methods = {
-            'GET': self.__get,
-            'POST': self.__post,
-            'PUT': self.__put,
-            'DELETE': self.__delete
-        }
-
         request_method = environ['REQUEST_METHOD'].upper()
+        if request_method == 'HEAD':
+            request_method = 'GET'
+        uri = self._get_uri(environ)
 
-        if request_method in request_methods:
-            match_list = request_methods[request_method]
-            result = self._find_match(environ, match_list)
-            if result:
-                return result
+        table = self._get_host_table(environ) if self._hosts else None
+        route = None
 
-        result = self._find_match(environ, self.__all)
-        if result:
-            return result
+        if table is not None:
+            route, params = table._lookup(environ, uri, request_method)
+        if route is None:
+            route, params = self._lookup(environ, uri, request_method)
+
+        if route:
+            request = Request(environ, DotDict(params))
+            response = Response(200, self.app.get_default_headers())
 
+            return (request, response, route)
+
+        allowed = self._get_allowed(environ, uri)
+        if table is not None:
+            allowed = sorted(set(allowed).union(
+                table._get_allowed(environ, uri)))
         request = Request(environ, None)
-        response = Response(404)
 
-        return (request, response, self.http404)
+        if not allowed:
+            return (request, Response(404), self.http404)
+        elif request_method == 'OPTIONS':
+            response = Response(200, {'Allow': ', '.join(allowed)})
+            return (request, response, self.options)
+        else:
+            response = Response(405, {'Allow': ', '.join(allowed)})
+            return (request, response, self.http405)
+
+    def _lookup(self, environ, uri, request_method):
+        '''
+        Returns a tuple of the matching :class:`RouteMapping
+        <gimme.routes.RouteMapping>` and its parameters, consulting and
+        filling :attr:`cache`. Both are ``None`` if nothing matches.
+        '''
+        key = (request_method, uri)
+        cached = self.cache.get(key) if self.cache is not None else None
+
+        if cached:
+            return cached
+
+        route, params, cacheable = self._resolve(environ, uri,
+            request_method)
+        if cacheable and self.cache is not None:
+            self.cache.set(key, (route, params))
+        return (route, params)
@@ -0,0 +1,464 @@
+import os
+import stat
+import time
+import json
+import hashlib
+import mimetypes
+from email.utils import formatdate, parsedate_tz, mktime_tz
+from .cache import LRUCache
+from .parsers.accepted import AcceptedList
+
+
+mimetypes.init()
+
+
+def http_date(timestamp):
+    '''
+    Formats a Unix timestamp as an HTTP date.
+    '''
+    return formatdate(timestamp, usegmt=True)
+
+
+def parse_http_date(value):
+    '''
+    Parses an HTTP date into a Unix timestamp, or ``None`` if it is invalid.
+    '''
+    parsed = parsedate_tz(value)
+    if parsed is None:
+        return None
+    try:
+        return mktime_tz(parsed)
+    except (OverflowError, ValueError):
+        return None
+
+
+class AssetManifest(object):
+    '''
+    Maps the URIs of static files to fingerprinted URIs that contain a hash
+    of their contents, such as ``/assets/app.3f9a1c2e.js`` for
+    ``/assets/app.js``. A fingerprinted URI changes whenever the file does,
+    so it can be cached forever.
+
+    Directories are hashed once, as they are added; that is normally done
+    at startup by passing the manifest to :meth:`Routes.static
+    <gimme.routes.Routes.static>` or :func:`static
+    <gimme.middleware.static>`, which then serve the fingerprinted URIs
+    with an immutable "Cache-Control" header. Given a ``filename``, the
+    manifest is loaded from it if it exists, and files whose size and
+    modification time haven't changed since aren't hashed again::
+
+        manifest = AssetManifest('assets.json')
+        app = gimme.App(engine=Jinja2Engine(manifest=manifest))
+        app.routes.static('/assets', 'public', manifest=manifest)
+        manifest.save()
+
+    Templates then link to ``{{ static_url('/assets/app.js') }}``.
+
+    A saved hash is trusted as long as the file's size and modification
+    time match. An edit that keeps the size, made within the resolution of
+    the filesystem's timestamps, therefore keeps the old hash, and the old
+    fingerprinted URI serves the new contents as immutable. Build steps
+    that can do that should delete the manifest file before startup.
+
+    :param str filename: The file to persist the manifest to, if any.
+    :param int hash_length: The number of hex digits of the hash to use.
+    '''
+    version = 1
+    block_size = 65536
+
+    def __init__(self, filename=None, hash_length=8):
+        self.filename = filename
+        self.hash_length = hash_length
+
+        # URI -> {'url', 'digest', 'mtime', 'size'}
+        self.files = {}
+
+        # Fingerprinted URI -> URI
+        self._reverse = {}
+
+        # The entries of the loaded manifest, to avoid hashing again
+        self._previous = {}
+
+        if filename and os.path.exists(filename):
+            self.load()
+
+    def __repr__(self):
+        return "<AssetManifest(%s files)>" % len(self.files)
+
+    def load(self, filename=None):
+        '''
+        Loads the hashes of a saved manifest, to be reused by :meth:`add`.
+        '''
+        with open(filename or self.filename) as f:
+            data = json.load(f)
+
+        if data.get('version') == self.version:
+            self._previous.update(data['files'])
+
+    def save(self, filename=None):
+        '''
+        Writes the manifest to ``filename``, or the one it was created with.
+        '''
+        filename = filename or self.filename
+        if not filename:
+            raise ValueError("No filename to save the manifest to.")
+        temp_filename = filename + '.tmp'
+
+        with open(temp_filename, 'w') as f:
+            json.dump({'version': self.version, 'files': self.files}, f,
+                indent=2, sort_keys=True)
+        os.rename(temp_filename, filename)
+
+    def hash_file(self, path):
+        digest = hashlib.md5()
+        with open(path, 'rb') as f:
+            for block in iter(lambda: f.read(self.block_size), ''):
+                digest.update(block)
+        return digest.hexdigest()
+
+    def make_url(self, uri, digest):
+        head, name = uri.rsplit('/', 1)
+        base, ext = os.path.splitext(name)
+        return '%s/%s.%s%s' % (head, base, digest[:self.hash_length], ext)
+
+    def add(self, path, prefix='/', exclude=()):
+        '''
+        Hashes the files of the local directory ``path``, which is served
+        under ``prefix``.
+
+        :param exclude: File name suffixes to skip, such as ``'.gz'``.
+        '''
+        path = os.path.abspath(path)
+        prefix = prefix.strip('/')
+        prefix = '/' + prefix if prefix else ''
+        exclude = tuple(exclude)
+
+        for root, dirs, names in os.walk(path):
+            for name in names:
+                if exclude and name.endswith(exclude):
+                    continue
+
+                local_path = os.path.join(root, name)
+                relative = os.path.relpath(local_path, path)
+                uri = '%s/%s' % (prefix, relative.replace(os.sep, '/'))
+
+                stat_result = os.stat(local_path)
+                entry = self._previous.get(uri)
+                if entry is None or (entry['mtime'], entry['size']) != (
+                        stat_result.st_mtime, stat_result.st_size):
+                    entry = {
+                        'digest': self.hash_file(local_path),
+                        'mtime': stat_result.st_mtime,
+                        'size': stat_result.st_size
+                    }
+
+                entry = dict(entry, url=self.make_url(uri, entry['digest']))
+                self.files[uri] = entry
+                self._reverse[entry['url']] = uri
+
+    def url(self, name):
+        '''
+        Returns the fingerprinted URI of the file at URI ``name``, or the
+        URI itself if the file isn't in the manifest. This is the
+        ``static_url()`` function of templates.
+        '''
+        uri = '/' + name.lstrip('/')
+        entry = self.files.get(uri)
+        return entry['url'] if entry is not None else uri
+
+    def resolve(self, url):
+        '''
+        Returns the URI of the file that fingerprinted URI ``url`` refers
+        to, or ``None``.
+        '''
+        return self._reverse.get(url)
+
+
+class StaticFile(object):
+    '''
+    A file as :class:`StaticFiles` sends it: its validators and headers, and
+    its contents if it is kept in memory.
+    '''
+    def __init__(self, path, stat_result, type, etag, encoding=None):
+        self.path = path
+        self.mtime = stat_result.st_mtime
+        self.size = stat_result.st_size
+        self.type = type
+        self.etag = etag
+        self.encoding = encoding
+        self.last_modified = http_date(self.mtime)
+        self.data = None
+        self.checked = time.time()
+
+    def __repr__(self):
+        return "<StaticFile(%s)>" % self.path
+
+
+class StaticFiles(object):
+    '''
+    Serves the files of a local directory under a URI prefix. This does the
+    work for :func:`gimme.middleware.static`.
+
+    Every file is sent with an ``ETag`` and a ``Last-Modified`` header made
+    from its :func:`os.stat`, and requests with a matching
+    ``If-None-Match`` or ``If-Modified-Since`` header get an empty
+    ``304 Not Modified`` response without the file being opened.
+
+    ``cache_control`` sets the ``Cache-Control`` header. It is either a
+    value for every file or a dict of URI prefixes and values, in which
+    case the longest matching prefix wins. Integers are taken as a max-age
+    in seconds::
+
+        StaticFiles('public', '/', cache_control={
+            '/': 300,
+            '/vendor/': 'public, max-age=31536000, immutable'
+        })
+
+    Precompressed copies of a file, such as ``app.js.gz`` next to
+    ``app.js``, are sent instead of the file to clients whose
+    "Accept-Encoding" allows it, with ``Content-Encoding`` and
+    ``Vary: Accept-Encoding`` headers. ``encodings`` lists the encodings to
+    look for and their file suffixes, in order of preference. Which copies
+    exist is remembered per file, so a request costs a single stat.
+
+    With ``memory_size`` set, files of up to ``memory_file_size`` bytes are
+    kept in memory along with their headers, up to ``memory_size`` bytes in
+    all, and the least recently used are dropped first. Their modification
+    time is checked at most every ``check_interval`` seconds, so in between
+    they are served without touching the filesystem. Range requests are
+    always read from the file.
+
+    Given an :class:`AssetManifest`, the files are added to it, and its
+    fingerprinted URIs are served with a "Cache-Control" header of
+    :attr:`immutable_cache_control`.
+
+    :param str path: The local directory to serve.
+    :param str prefix: The URI prefix to serve it under.
+    :param cache_control: See above.
+    :param encodings: A list of ``(encoding, suffix)`` tuples.
+    :param int memory_size: The total bytes of files to keep in memory.
+    :param int memory_file_size: The largest file to keep in memory.
+    :param check_interval: Seconds between checks of a file in memory.
+    :param manifest: An :class:`AssetManifest`.
+    '''
+    immutable_cache_control = 'public, max-age=31536000, immutable'
+
+    def __init__(self, path, prefix='/', cache_control=None,
+            encodings=(('gzip', '.gz'),), memory_size=0,
+            memory_file_size=65536, check_interval=1, manifest=None):
+        self.path = os.path.abspath(path)
+        self.prefix = prefix.strip('/')
+        self.encodings = list(encodings or [])
+        self.memory_file_size = memory_file_size
+        self.check_interval = check_interval
+
+        # Local path -> ((encoding, path), ...) of its precompressed copies
+        self._variants = LRUCache(4096)
+
+        # File path -> StaticFile, for the files kept in memory
+        self.memory = (LRUCache(memory_size, weigh=lambda i: len(i.data))
+            if memory_size else None)
+
+        self.manifest = manifest
+        if manifest is not None:
+            manifest.add(self.path, self.prefix,
+                [suffix for encoding, suffix in self.encodings])
+
+        if not isinstance(cache_control, dict):
+            cache_control = {'': cache_control} if cache_control else {}
+
+        self.cache_control = sorted(
+            ((uri, self._make_cache_control(value))
+                for uri, value in cache_control.iteritems()),
+            key=lambda item: len(item[0]), reverse=True)
+
+    @staticmethod
+    def _make_cache_control(value):
+        if isinstance(value, (int, long)):
+            return 'public, max-age=%d' % value
+        return value
+
+    def get_local_path(self, uri):
+        '''
+        Returns the local path of the file that ``uri`` refers to, or
+        ``None`` if ``uri`` is outside of :attr:`prefix` or :attr:`path`.
+        '''
+        if self.prefix and not (uri + '/').startswith(
+                '/' + self.prefix + '/'):
+            return None
+
+        relative = uri.strip('/')[len(self.prefix):].lstrip('/')
+        local_path = os.path.abspath(os.path.join(self.path, relative))
+
+        if local_path.startswith(self.path + os.sep):
+            return local_path
+        return None
+
+    def get_cache_control(self, uri):
+        for prefix, value in self.cache_control:
+            if uri.startswith(prefix):
+                return value
+        return None
+
+    def make_etag(self, stat_result, encoding=None):
+        if encoding:
+            return '"%x-%x-%s"' % (int(stat_result.st_mtime),
+                stat_result.st_size, encoding)
+        return '"%x-%x"' % (int(stat_result.st_mtime), stat_result.st_size)
+
+    def _get_variants(self, local_path):
+        variants = self._variants.get(local_path)
+        if variants is None:
+            # Not cached for missing files, which would fill the cache
+            if not os.path.isfile(local_path):
+                return ()
+            variants = tuple((encoding, local_path + suffix)
+                for encoding, suffix in self.encodings
+                if os.path.isfile(local_path + suffix))
+            self._variants.set(local_path, variants)
+        return variants
+
+    @staticmethod
+    def _accepts_encoding(accepted, encoding):
+        wildcard = None
+        for i in accepted:
+            if i.value == encoding:
+                return i.priority > 0
+            elif i.value == '*' and wildcard is None:
+                wildcard = i
+        return wildcard is not None and wildcard.priority > 0
+
+    def _get_file(self, local_path, path, encoding, use_memory):
+        entry = self.memory.get(path) if use_memory else None
+        now = time.time()
+
+        if entry is not None and now - entry.checked < self.check_interval:
+            return entry
+
+        stat_result = os.stat(path)
+        if not stat.S_ISREG(stat_result.st_mode):
+            return None
+
+        if entry is not None and (entry.mtime, entry.size) == (
+                stat_result.st_mtime, stat_result.st_size):
+            entry.checked = now
+            return entry
+
+        content_type = (mimetypes.guess_type(local_path)[0] or
+            'application/x-octet-stream')
+        entry = StaticFile(path, stat_result, content_type,
+            self.make_etag(stat_result, encoding), encoding)
+
+        if use_memory and entry.size <= self.memory_file_size:
+            with open(path, 'rb') as f:
+                data = f.read()
+            if len(data) == entry.size:
+                entry.data = data
+                self.memory.set(path, entry)
+
+        return entry
+
+    def _select(self, request, local_path, variants):
+        '''
+        Returns the :class:`StaticFile` of the copy of ``local_path`` to
+        send, or ``None`` if there is no such file.
+        '''
+        candidates = []
+        accept_encoding = request.headers.get('accept_encoding')
+
+        if variants and accept_encoding:
+            accepted = AcceptedList.intern(accept_encoding)
+            candidates = [(path, encoding) for encoding, path in variants
+                if self._accepts_encoding(accepted, encoding)]
+        candidates.append((local_path, None))
+
+        use_memory = (self.memory is not None and
+            request.headers.get('range') is None)
+
+        for path, encoding in candidates:
+            try:
+                entry = self._get_file(local_path, path, encoding, use_memory)
+            except (IOError, OSError):
+                entry = None
+
+            if entry is not None:
+                return entry
+            elif encoding:
+                # Gone since it was cached; look again next time
+                self._variants.set(local_path, None)
+        return None
+
+    def is_not_modified(self, request, etag, mtime):
+        '''
+        Whether the conditional headers of ``request`` show that the client
+        already has the current version of the file.
+        '''
+        if_none_match = request.headers.get('if_none_match')
+        if if_none_match is not None:
+            tags = [i.strip() for i in if_none_match.split(',')]
+            return '*' in tags or etag in [
+                i[2:] if i.startswith('W/') else i for i in tags]
+
+        if_modified_since = request.headers.get('if_modified_since')
+        if if_modified_since is not None:
+            timestamp = parse_http_date(if_modified_since)
+            return timestamp is not None and int(mtime) <= timestamp
+
+        return False
+
+    def serve(self, request, response, uri=None):
+        '''
+        Prepares ``response`` to send the file that ``request`` asks for.
+
+        :param str uri: The URI of the file, if not the request's
+            ``PATH_INFO``.
+        :return: ``True`` if a file was found, ``False`` if the request
+            should be handled by the routes instead.
+        '''
+        if uri is None:
+            uri = request.headers.path_info
+
+        cache_control = None
+        if self.manifest is not None:
+            fingerprinted = self.manifest.resolve(uri)
+            if fingerprinted is not None:
+                uri = fingerprinted
+                cache_control = self.immutable_cache_control
+
+        local_path = self.get_local_path(uri)
+        if local_path is None:
+            return False
+
+        variants = self._get_variants(local_path) if self.encodings else ()
+        entry = self._select(request, local_path, variants)
+        if entry is None:
+            return False
+
+        response.type = entry.type
+        response.headers['ETag'] = entry.etag
+
+        if variants:
+            response.headers['Vary'] = 'Accept-Encoding'
+        if entry.encoding:
+            response.headers['Content-Encoding'] = entry.encoding
+        response.headers['Last-Modified'] = entry.last_modified
+
+        cache_control = cache_control or self.get_cache_control(uri)
+        if cache_control:
+            response.headers['Cache-Control'] = cache_control
+
+        if self.is_not_modified(request, entry.etag, entry.mtime):
+            response.status = 304
+            response.body = ''
+            return True
+
+        if entry.data is not None:
+            response.body = entry.data
+        else:
+            try:
+                response.body = open(entry.path, 'rb')
+            except (IOError, OSError):
+                return False
+
+        response.status = 200
+        return True
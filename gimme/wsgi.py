@@ -22,6 +22,13 @@ class WSGIAdapter(object):
             self.app.middleware)
 
     def process(self, environ, start_response):
+        static = self.app.routes.serve_static(environ)
+        if static is not None:
+            request, response = static
+            response.apply_range(request)
+            start_response(str(response.status), response.get_headers())
+            return self._get_body(environ, response)
+
         request, response, route = self.app.routes.match(environ)
 
         try:
@@ -29,20 +36,31 @@ class WSGIAdapter(object):
         except Exception, e:
             if isinstance(e, Response):
                 start_response(str(e.status), e.get_headers())
-                return e.body
+                return self._get_body(environ, e)
             else:
                 err = e if isinstance(e, HTTPError) else HTTPError(500)
                 err_response, err_route = err.make_response(self.app)
                 self._render(request, err_response, err_route, [])
                 start_response(str(err_response.status), err_response.get_headers())
-                return err_response.body
+                return self._get_body(environ, err_response)
         else:
+            response.apply_range(request)
             start_response(str(response.status), response.get_headers())
-            return response.body
+            return self._get_body(environ, response)
+
+    def _get_body(self, environ, response):
+        # Responses to HEAD requests carry the headers of the GET response,
+        # but the body is never iterated.
+        if environ.get('REQUEST_METHOD', '').upper() == 'HEAD':
+            response.body.close()
+            return []
+        return response.body.get_iterable(environ)
 
     def _render(self, request, response, route, middleware=None):
         if middleware is None:
-            middleware = self.app.middleware + route.middleware
+            middleware = route.resolved_middleware
+            if middleware is None:
+                middleware = self.app.middleware + route.middleware
         elif not middleware:
             middleware = []
 
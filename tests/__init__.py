@@ -7,3 +7,7 @@ from . import dotdict
 from . import middleware
 from . import controller
 from . import renderers
+from . import cache
+from . import app
+from . import benchmark
+from . import static
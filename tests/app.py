@@ -0,0 +1,110 @@
+import unittest
+import gimme
+from gimme.routes import Route
+from gimme.errors import RouteError, GimmeError
+from .test_helpers import make_environ
+
+
+class FreezeTest(unittest.TestCase):
+    def setUp(self):
+        self.app = gimme.App()
+
+        class TestMiddleware(gimme.middleware.Middleware):
+            pass
+
+        class TestController(gimme.Controller):
+            def low(self, request, response):
+                return 'low'
+
+            def high(self, request, response):
+                return 'high'
+
+        self.middleware = TestMiddleware
+        self.controller = TestController
+
+    def test_sort(self):
+        self.app.routes.get('/:name', self.controller.low)
+        self.app.routes.get('/first', self.controller.low)
+        self.app.routes.get(Route('/:other', priority=20),
+            self.controller.high)
+        self.app.freeze()
+
+        request, response, route = self.app.routes.match(make_environ(
+            uri='/first'))
+        self.assertIs(route.method, self.controller.high)
+        self.assertEqual(request.params.other, 'first')
+
+    def test_sort_unfrozen(self):
+        self.app.routes.get('/:name', self.controller.low)
+        self.app.routes.get(Route('/:other', priority=20),
+            self.controller.high)
+        self.app.routes.get('/:third', self.controller.low)
+
+        request, response, route = self.app.routes.match(make_environ(
+            uri='/first'))
+        self.assertIs(route.method, self.controller.high)
+        self.assertEqual([i.pattern.priority for i in
+            self.app.routes._route_lists['GET']], [20, 10, 10])
+
+    def test_stable_sort(self):
+        self.app.routes.get('/:name', self.controller.high)
+        self.app.routes.get('/:other', self.controller.low)
+        self.app.freeze()
+
+        request, response, route = self.app.routes.match(make_environ(
+            uri='/first'))
+        self.assertIs(route.method, self.controller.high)
+
+    def test_middleware(self):
+        self.app.use(self.middleware)
+        self.app.routes.get('/', self.middleware, self.controller.low)
+        self.app.freeze()
+
+        request, response, route = self.app.routes.match(make_environ())
+        self.assertEqual(route.resolved_middleware,
+            [self.middleware, self.middleware])
+        self.assertEqual(self.app.routes.http404.resolved_middleware,
+            [self.middleware])
+
+    def test_default_headers(self):
+        headers = self.app.get_default_headers()
+        self.assertIs(headers, self.app.get_default_headers())
+        self.app.freeze()
+        self.assertIs(headers, self.app.get_default_headers())
+
+        self.app.set('default headers', {'X-Test': 'test'})
+        headers = self.app.get_default_headers()
+        self.assertEqual(headers.items(), [('X-Test', 'test')])
+        self.assertIs(headers, self.app.get_default_headers())
+
+    def test_shared_headers(self):
+        self.app.routes.get('/', self.controller.low)
+        self.app.freeze()
+        defaults = self.app.get_default_headers()
+        self.assertRaises(TypeError, defaults.__setitem__, 'X-Test', 'test')
+
+        request, response, route = self.app.routes.match(make_environ())
+        self.assertIs(response.headers._headers, defaults._headers)
+        self.assertEqual(response.get_headers(), response.get_headers())
+
+        response.set('X-Test', 'test')
+        self.assertIsNot(response.headers._headers, defaults._headers)
+        self.assertTrue('X-Test' not in defaults)
+        self.assertTrue(('X-Test', 'test') in response.get_headers())
+
+    def test_immutable(self):
+        self.assertIs(self.app.freeze(), self.app)
+
+        with self.assertRaises(RouteError):
+            self.app.routes.get('/', self.controller.low)
+
+        with self.assertRaises(GimmeError):
+            self.app.use(self.middleware)
+
+    def test_server(self):
+        class FakeServer(object):
+            def __init__(self, address, app):
+                self.app = app
+
+        self.app.server(server_class=FakeServer)
+        self.assertTrue(self.app.frozen)
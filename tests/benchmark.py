@@ -0,0 +1,177 @@
+'''
+Measures how the cost of :meth:`Routes.match <gimme.routes.Routes.match>`
+grows with the size of the route table.
+
+Synthetic tables of 10 to 10,000 routes are generated, mixing static
+routes, ``:param`` routes, optional parameters and :class:`RouteList
+<gimme.routes.RouteList>` unions. For every table, requests that match the
+first, middle and last route, as well as requests that match nothing, are
+timed. Run it from the repository root::
+
+    python -m tests.benchmark -o benchmark.json
+
+The JSON file records throughput and p50/p99 latency for every combination
+of dispatcher, table size and case, so that the results of two commits can
+be diffed.
+'''
+import argparse
+import json
+import platform
+import subprocess
+import timeit
+import unittest
+import gimme
+from gimme.routes import Routes, RouteList
+from gimme.dispatchers import LinearDispatcher, TreeDispatcher, RegexDispatcher
+from .test_helpers import make_environ
+
+
+SIZES = (10, 100, 1000, 10000)
+CASES = ('first', 'middle', 'last', 'missing')
+DISPATCHERS = {
+    'linear': LinearDispatcher,
+    'tree': TreeDispatcher,
+    'regex': RegexDispatcher
+}
+
+
+class BenchmarkController(gimme.Controller):
+    def index(self, request, response):
+        return ''
+
+
+def make_route(i):
+    '''
+    Returns the pattern of the ``i``th synthetic route and a URI that it
+    matches.
+    '''
+    kind = i % 4
+    if kind == 0:
+        return ('/static%s/page' % i, '/static%s/page' % i)
+    elif kind == 1:
+        return ('/items%s/:id' % i, '/items%s/42' % i)
+    elif kind == 2:
+        return ('/archive%s/:year/:month?' % i, '/archive%s/2014/05' % i)
+    else:
+        return (RouteList(['/alias%s/:id' % i, '/other%s/:id/edit' % i]),
+            '/other%s/42/edit' % i)
+
+
+def make_app(size, dispatcher):
+    '''
+    Returns a frozen app with ``size`` routes and a dict of the URI to
+    request for every case.
+
+    The first and middle cases target parameterized routes; static routes
+    are answered from a dict regardless of their position.
+    '''
+    app = gimme.App()
+    app.routes = Routes(app, dispatcher=dispatcher)
+    uris = {}
+
+    for i in xrange(size):
+        pattern, uri = make_route(i)
+        app.routes.get(pattern, BenchmarkController.index)
+        if i == 1:
+            uris['first'] = uri
+        if i == size // 2 + 1:
+            uris['middle'] = uri
+        if i == size - 1:
+            uris['last'] = uri
+    uris['missing'] = '/missing/page'
+
+    return (app.freeze(), uris)
+
+
+def measure(app, uri, iterations):
+    environ = make_environ('GET', uri)
+    match = app.routes.match
+    timer = timeit.default_timer
+    latencies = []
+
+    for i in xrange(iterations):
+        start = timer()
+        match(environ)
+        latencies.append(timer() - start)
+
+    latencies.sort()
+    return {
+        'ops_per_sec': iterations / sum(latencies),
+        'p50_us': latencies[len(latencies) // 2] * 1e6,
+        'p99_us': latencies[min(len(latencies) - 1,
+            int(len(latencies) * 0.99))] * 1e6
+    }
+
+
+def run(sizes=SIZES, dispatchers=('tree',), iterations=1000):
+    results = []
+
+    for name in dispatchers:
+        for size in sizes:
+            app, uris = make_app(size, DISPATCHERS[name])
+            for case in CASES:
+                result = {'dispatcher': name, 'routes': size, 'case': case}
+                result.update(measure(app, uris[case], iterations))
+                results.append(result)
+
+    return results
+
+
+def get_revision():
+    try:
+        return subprocess.check_output(['git', 'rev-parse', 'HEAD'],
+            stderr=subprocess.STDOUT).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def get_args():
+    parser = argparse.ArgumentParser(
+        description='Route table scaling benchmark for Gimme')
+    parser.add_argument('-o', '--output', default='benchmark.json',
+        help='The JSON file to write the results to.')
+    parser.add_argument('-n', '--iterations', type=int, default=1000,
+        help='Requests to time per case.')
+    parser.add_argument('-s', '--sizes', type=int, nargs='+', default=SIZES,
+        help='Route table sizes to generate.')
+    parser.add_argument('-d', '--dispatchers', nargs='+', default=['tree'],
+        choices=sorted(DISPATCHERS), help='Dispatchers to benchmark.')
+    return parser.parse_args()
+
+
+def main():
+    args = get_args()
+    results = run(args.sizes, args.dispatchers, args.iterations)
+
+    for result in results:
+        print '%(dispatcher)-8s %(routes)6s %(case)-8s %(ops_per_sec)10.0f/s' \
+            ' p50 %(p50_us)8.1fus p99 %(p99_us)8.1fus' % result
+
+    with open(args.output, 'w') as f:
+        json.dump({
+            'revision': get_revision(),
+            'python': platform.python_version(),
+            'iterations': args.iterations,
+            'results': results
+        }, f, indent=2, sort_keys=True)
+
+
+class BenchmarkTest(unittest.TestCase):
+    def test_run(self):
+        results = run(sizes=(10,), dispatchers=sorted(DISPATCHERS),
+            iterations=5)
+        self.assertEqual(len(results), len(DISPATCHERS) * len(CASES))
+        for result in results:
+            self.assertTrue(result['p50_us'] <= result['p99_us'])
+
+    def test_cases(self):
+        app, uris = make_app(10, TreeDispatcher)
+        for case in ('first', 'middle', 'last'):
+            route = app.routes.match(make_environ('GET', uris[case]))[2]
+            self.assertIs(route.method, BenchmarkController.index)
+        route = app.routes.match(make_environ('GET', uris['missing']))[2]
+        self.assertIs(route, app.routes.http404)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,54 @@
+import unittest
+from gimme.cache import LRUCache
+
+
+class LRUCacheTest(unittest.TestCase):
+    def setUp(self):
+        self.cache = LRUCache(2)
+
+    def test_get_set(self):
+        self.cache.set('a', 1)
+        assert self.cache.get('a') == 1
+        assert self.cache.get('b') is None
+        assert self.cache.get('b', 2) == 2
+
+    def test_eviction(self):
+        self.cache.set('a', 1)
+        self.cache.set('b', 2)
+        self.cache.get('a')
+        self.cache.set('c', 3)
+
+        assert 'a' in self.cache
+        assert 'b' not in self.cache
+        assert 'c' in self.cache
+        assert len(self.cache) == 2
+
+    def test_counters(self):
+        self.cache.set('a', 1)
+        self.cache.get('a')
+        self.cache.get('a')
+        self.cache.get('b')
+
+        assert self.cache.hits == 2
+        assert self.cache.misses == 1
+        assert self.cache.info() == {'hits': 2, 'misses': 1, 'size': 1,
+            'max_size': 2}
+        assert abs(self.cache.hit_rate - 2 / 3.0) < 0.001
+
+    def test_weigh(self):
+        cache = LRUCache(10, weigh=len)
+        cache.set('a', 'x' * 4)
+        cache.set('b', 'x' * 4)
+        cache.set('a', 'x' * 2)
+        assert cache.weight == 6
+
+        cache.set('c', 'x' * 5)
+        assert 'a' in cache and 'b' not in cache and 'c' in cache
+        assert cache.weight == 7
+
+        cache.set('d', 'x' * 11)
+        assert 'd' not in cache
+        assert cache.weight == 7
+
+        cache.clear()
+        assert cache.weight == 0
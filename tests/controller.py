@@ -1,6 +1,12 @@
 import unittest
 import gimme
-from gimme.controller import Controller, ControllerMethod, MethodRenderer
+from gimme.controller import (
+    Controller,
+    ControllerMethod,
+    MethodRenderer,
+    ErrorController
+)
+from gimme.errors import HTTPError
 from gimme.engines import Jinja2Engine
 from gimme.renderers import Format, BulkRenderer, Template, Json, Compress
 from test_helpers import make_environ
@@ -93,3 +99,35 @@ class MethodRendererTest(ControllerSetUp, unittest.TestCase):
         # Need to instantiate the controller before templates can be rendered
         controller = self.TestController(self.app)
         assert self.method_renderer(None, None) == 'this is a test. is test data'
+
+
+class ErrorControllerTest(unittest.TestCase):
+    def setUp(self):
+        self.app = gimme.App()
+
+    def start_response(self, status, headers):
+        self.status = status
+
+    def test_shared_templates(self):
+        first = ErrorController(self.app)
+        second = ErrorController(self.app)
+        self.assertIs(first.environment, second.environment)
+        self.assertIs(first._get_template('errors/404.html'),
+            second._get_template('errors/404.html'))
+
+    def test_http_error_route(self):
+        self.assertIs(HTTPError(404).route, HTTPError(404).route)
+        self.assertIs(HTTPError(418).route.method, ErrorController.generic)
+
+    def test_static_errors(self):
+        self.app.set('static errors', True)
+        first = ''.join(self.app(make_environ('GET', '/nowhere'),
+            self.start_response))
+        self.assertEqual(self.status, '404 Not Found')
+
+        environ = make_environ('GET', '/elsewhere')
+        environ['HTTP_USER_AGENT'] = 'scanner'
+        second = ''.join(self.app(environ, self.start_response))
+        self.assertEqual(first, second)
+        self.assertTrue('404 File Not Found' in first)
+        self.assertTrue(first in ErrorController._static_bodies.values())
@@ -85,3 +85,45 @@ class HeadersTest(unittest.TestCase):
 
     def test_iteritems(self):
         assert len(list(self.headers.iteritems())) == 2
+
+    def test_case_insensitive(self):
+        self.headers['content-type'] = 'text/plain'
+        assert len(self.headers) == 2
+        assert self.headers['CONTENT-TYPE'] == 'text/plain'
+        assert self.headers['Content-Type'].key == 'Content-Type'
+        del(self.headers['content-length'])
+        assert 'Content-Length' not in self.headers
+        assert self.headers.keys() == ['Content-Type']
+
+    def test_multiple_values(self):
+        self.headers.add_header(headers.Header('Set-Cookie', 'a=1'))
+        self.headers.add_header(headers.Header('set-cookie', 'b=2'))
+        assert self.headers['Set-Cookie'] == 'a=1'
+        assert [i.value for i in self.headers.get_all('SET-COOKIE')] == [
+            'a=1', 'b=2']
+        assert len(self.headers.keys()) == 3
+
+    def test_copy_on_write(self):
+        self.headers.freeze()
+        self.assertRaises(TypeError, self.headers.__setitem__, 'A', 'b')
+        shared = headers.HeadersDict(self.headers)
+        assert shared._headers is self.headers._headers
+
+        del(shared['Content-Type'])
+        assert 'Content-Type' in self.headers
+        assert 'Content-Type' not in shared
+        assert len(shared) == 1
+
+    def test_frozen_header(self):
+        self.headers.freeze()
+        shared = headers.HeadersDict(self.headers)
+        header = shared['Content-Type']
+        self.assertRaises(TypeError, setattr, header, 'value', 'text/plain')
+
+        shared['Content-Type'] = 'text/plain'
+        assert shared['Content-Type'] == 'text/plain'
+        assert self.headers['Content-Type'] == 'application/pdf'
+
+        copy = self.headers.copy()
+        copy['Content-Type'] = 'text/plain'
+        assert self.headers['Content-Type'] == 'application/pdf'
@@ -1,7 +1,10 @@
+import os
 import gimme
 import unittest
 import zlib
-from .test_helpers import make_environ
+from gimme.output import FileIterator
+from gimme.static import StaticFiles
+from .test_helpers import make_environ, StaticSetUp
 
 
 class MiddlewareTest(unittest.TestCase):
@@ -110,6 +113,259 @@ class CompressTest(MiddlewareTest):
         assert str(response.body) == 'endpoint1_response'
 
 
+class StaticTest(StaticSetUp, MiddlewareTest):
+    data = '\x00\r\nbinary\xff' * 1000
+    files = {'app.js': data}
+
+    def setUp(self):
+        super(StaticTest, self).setUp()
+        self.app.use(gimme.middleware.static(self.path, '/assets'))
+        self.environ = make_environ('GET', '/assets/app.js')
+
+    def test_file_iterator(self):
+        body = self.app(self.environ, self.start_response)
+        assert isinstance(body, FileIterator)
+        assert ''.join(body) == self.data
+        assert self.headers['Content-Length'] == str(len(self.data))
+        body.close()
+        assert body.fileobj.closed
+
+    def test_file_wrapper(self):
+        self.environ['wsgi.file_wrapper'] = lambda f, size: ('wrapped', f,
+            size)
+        wrapped, f, size = self.app(self.environ, self.start_response)
+        assert f.mode == 'rb' and not f.closed
+        assert size == 65536
+        f.close()
+
+
+class ConditionalStaticTest(StaticSetUp, MiddlewareTest):
+    files = {'app.js': 'data', 'vendor/lib.js': 'data'}
+
+    def setUp(self):
+        super(ConditionalStaticTest, self).setUp()
+        os.utime(os.path.join(self.path, 'app.js'), (1000000000, 1000000000))
+
+        self.app.use(gimme.middleware.static(self.path, '/assets', {
+            '/assets/': 60,
+            '/assets/vendor/': 'public, max-age=31536000'
+        }))
+
+    def test_validators(self):
+        assert self.get('/assets/app.js') == 'data'
+        assert self.status == '200 OK'
+        assert self.headers['Last-Modified'] == (
+            'Sun, 09 Sep 2001 01:46:40 GMT')
+        assert self.headers['Cache-Control'] == 'public, max-age=60'
+
+        self.get('/assets/vendor/lib.js')
+        assert self.headers['Cache-Control'] == 'public, max-age=31536000'
+
+    def test_if_none_match(self):
+        self.get('/assets/app.js')
+        etag = self.headers['ETag']
+
+        assert self.get('/assets/app.js', HTTP_IF_NONE_MATCH=etag) == ''
+        assert self.status == '304 Not Modified'
+        assert 'Content-Length' not in self.headers
+        assert self.headers['ETag'] == etag
+
+        self.get('/assets/app.js', HTTP_IF_NONE_MATCH='"other", W/' + etag)
+        assert self.status == '304 Not Modified'
+
+        self.get('/assets/app.js', HTTP_IF_NONE_MATCH='"other"',
+            HTTP_IF_MODIFIED_SINCE='Sun, 09 Sep 2001 01:46:40 GMT')
+        assert self.status == '200 OK'
+
+    def test_if_modified_since(self):
+        self.get('/assets/app.js',
+            HTTP_IF_MODIFIED_SINCE='Sun, 09 Sep 2001 01:46:40 GMT')
+        assert self.status == '304 Not Modified'
+
+        self.get('/assets/app.js',
+            HTTP_IF_MODIFIED_SINCE='Sun, 09 Sep 2001 01:46:39 GMT')
+        assert self.status == '200 OK'
+
+    def test_outside_path(self):
+        self.get('/assets/../../etc/passwd')
+        assert self.status == '404 Not Found'
+
+
+class RangeStaticTest(StaticSetUp, MiddlewareTest):
+    data = ''.join(chr(i) for i in xrange(256)) * 4
+    files = {'video.mp4': data}
+    uri = '/media/video.mp4'
+
+    def setUp(self):
+        super(RangeStaticTest, self).setUp()
+        self.app.use(gimme.middleware.static(self.path, '/media'))
+
+    def test_full(self):
+        assert self.get() == self.data
+        assert self.headers['Accept-Ranges'] == 'bytes'
+
+    def test_single_range(self):
+        assert self.get(HTTP_RANGE='bytes=10-19') == self.data[10:20]
+        assert self.status == '206 Partial Content'
+        assert self.headers['Content-Range'] == 'bytes 10-19/1024'
+        assert self.headers['Content-Length'] == '10'
+
+        assert self.get(HTTP_RANGE='bytes=-24') == self.data[-24:]
+        assert self.headers['Content-Range'] == 'bytes 1000-1023/1024'
+        assert self.headers['Content-Length'] == '24'
+
+    def test_multiple_ranges(self):
+        body = self.get(HTTP_RANGE='bytes=0-1,1020-')
+        assert self.status == '206 Partial Content'
+        content_type = self.headers['Content-Type']
+        assert content_type.startswith('multipart/byteranges; boundary=')
+        boundary = content_type.split('=', 1)[1]
+
+        assert len(body) == int(self.headers['Content-Length'])
+        assert body == (
+            '--%(b)s\r\nContent-Type: video/mp4; charset=utf-8\r\n'
+            'Content-Range: bytes 0-1/1024\r\n\r\n%(first)s\r\n'
+            '--%(b)s\r\nContent-Type: video/mp4; charset=utf-8\r\n'
+            'Content-Range: bytes 1020-1023/1024\r\n\r\n%(last)s\r\n'
+            '--%(b)s--\r\n') % {
+                'b': boundary,
+                'first': self.data[:2],
+                'last': self.data[-4:]
+            }
+
+    def test_unsatisfiable(self):
+        assert self.get(HTTP_RANGE='bytes=2000-') == ''
+        assert self.status == '416 Request Range Not Satisfiable'
+        assert self.headers['Content-Range'] == 'bytes */1024'
+
+    def test_if_range(self):
+        self.get()
+        etag = self.headers['ETag']
+
+        assert self.get(HTTP_RANGE='bytes=0-0', HTTP_IF_RANGE=etag) == (
+            self.data[0])
+        assert self.get(HTTP_RANGE='bytes=0-0', HTTP_IF_RANGE='"old"') == (
+            self.data)
+        assert self.status == '200 OK'
+
+
+class PrecompressedStaticTest(StaticSetUp, MiddlewareTest):
+    data = 'var a = 1;' * 10
+    files = {
+        'app.js': data,
+        'app.js.gz': 'gzipped',
+        'app.js.br': 'brotli',
+        'plain.js': data
+    }
+    uri = '/assets/app.js'
+
+    def setUp(self):
+        super(PrecompressedStaticTest, self).setUp()
+        self.app.use(gimme.middleware.static(self.path, '/assets',
+            encodings=[('br', '.br'), ('gzip', '.gz')]))
+
+    def test_identity(self):
+        assert self.get() == self.data
+        assert 'Content-Encoding' not in self.headers
+        assert self.headers['Vary'] == 'Accept-Encoding'
+
+        assert self.get('/assets/plain.js',
+            HTTP_ACCEPT_ENCODING='gzip') == self.data
+        assert 'Content-Encoding' not in self.headers
+        assert 'Vary' not in self.headers
+
+    def test_negotiation(self):
+        assert self.get(HTTP_ACCEPT_ENCODING='gzip, br') == 'brotli'
+        assert self.headers['Content-Encoding'] == 'br'
+        assert 'javascript' in self.headers['Content-Type']
+        assert self.headers['Content-Length'] == '6'
+
+        assert self.get(HTTP_ACCEPT_ENCODING='gzip, br;q=0') == 'gzipped'
+        assert self.headers['Content-Encoding'] == 'gzip'
+
+        assert self.get(HTTP_ACCEPT_ENCODING='deflate') == self.data
+        assert self.get(HTTP_ACCEPT_ENCODING='*;q=0') == self.data
+
+        # An explicit refusal wins over the wildcard
+        assert self.get(HTTP_ACCEPT_ENCODING='*, gzip;q=0') == 'brotli'
+        assert self.get(HTTP_ACCEPT_ENCODING='*, br;q=0') == 'gzipped'
+        assert self.get(HTTP_ACCEPT_ENCODING='*, gzip;q=0, br;q=0') == \
+            self.data
+
+    def test_etag(self):
+        self.get(HTTP_ACCEPT_ENCODING='gzip')
+        etag = self.headers['ETag']
+        assert etag.endswith('-gzip"')
+
+        self.get(HTTP_ACCEPT_ENCODING='gzip', HTTP_IF_NONE_MATCH=etag)
+        assert self.status == '304 Not Modified'
+        self.get(HTTP_IF_NONE_MATCH=etag)
+        assert self.status == '200 OK'
+
+    def test_removed(self):
+        self.get(HTTP_ACCEPT_ENCODING='br')
+        os.remove(os.path.join(self.path, 'app.js.br'))
+        assert self.get(HTTP_ACCEPT_ENCODING='br') == self.data
+        assert self.get(HTTP_ACCEPT_ENCODING='br, gzip') == 'gzipped'
+
+    def test_not_a_file(self):
+        self.get(HTTP_ACCEPT_ENCODING='br')
+        os.remove(os.path.join(self.path, 'app.js.br'))
+        os.mkdir(os.path.join(self.path, 'app.js.br'))
+        assert self.get(HTTP_ACCEPT_ENCODING='br') == self.data
+        assert self.status == '200 OK'
+
+    def test_missing_not_cached(self):
+        files = StaticFiles(self.path, '/assets')
+        assert files._get_variants(os.path.join(self.path, 'app.js')) == (
+            ('gzip', os.path.join(self.path, 'app.js.gz')),)
+        assert files._get_variants(os.path.join(self.path, 'x.js')) == ()
+        assert len(files._variants) == 1
+
+
+class MemoryStaticTest(StaticSetUp, MiddlewareTest):
+    files = {'icon.png': 'icon', 'big.png': 'x' * 100}
+
+    def setUp(self):
+        super(MemoryStaticTest, self).setUp()
+        self.app.use(gimme.middleware.static(self.path, '/hot',
+            memory_size=1024, memory_file_size=64, check_interval=3600))
+        self.app.use(gimme.middleware.static(self.path, '/fresh',
+            memory_size=1024, check_interval=0))
+
+    def test_memory(self):
+        assert self.get('/hot/icon.png') == 'icon'
+        assert self.headers['Content-Length'] == '4'
+        etag = self.headers['ETag']
+
+        # Served from memory without looking at the file again
+        os.remove(os.path.join(self.path, 'icon.png'))
+        assert self.get('/hot/icon.png') == 'icon'
+        assert self.headers['ETag'] == etag
+        self.get('/hot/icon.png', HTTP_IF_NONE_MATCH=etag)
+        assert self.status == '304 Not Modified'
+
+    def test_too_large(self):
+        self.get('/hot/big.png')
+        os.remove(os.path.join(self.path, 'big.png'))
+        self.get('/hot/big.png')
+        assert self.status == '404 Not Found'
+
+    def test_revalidate(self):
+        assert self.get('/fresh/icon.png') == 'icon'
+        self.write('icon.png', 'new icon')
+        assert self.get('/fresh/icon.png') == 'new icon'
+
+        os.remove(os.path.join(self.path, 'icon.png'))
+        self.get('/fresh/icon.png')
+        assert self.status == '404 Not Found'
+
+    def test_range(self):
+        self.get('/hot/icon.png')
+        assert self.get('/hot/icon.png', HTTP_RANGE='bytes=1-2') == 'co'
+        assert self.status == '206 Partial Content'
+
+
 class BodyParserTest(MiddlewareTest):
     def setUp(self):
         self.app.use(gimme.middleware.body_parser())
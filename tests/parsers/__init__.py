@@ -2,3 +2,4 @@ from . import multipart
 from . import contenttype
 from . import accepted
 from . import status
+from . import range
@@ -46,3 +46,23 @@ class AcceptedListTest(unittest.TestCase):
 
     def test_get_highest_priority(self):
         assert self.accepted.get_highest_priority() == 'text/plain'
+
+    def test_intern(self):
+        header = 'text/html ;q=0.8,application/json;q=0.5'
+        interned = AcceptedList.intern(header, ContentType)
+        assert interned is AcceptedList.intern(header, ContentType)
+        assert interned is not AcceptedList.intern(header)
+        assert interned.get_by_priority() is interned.get_by_priority()
+        assert interned.get_highest_priority() == 'text/html'
+        self.assertRaises(TypeError, interned.append, None)
+        self.assertRaises(TypeError, interned.sort)
+
+        item = interned[0]
+        self.assertRaises(TypeError, setattr, item, 'priority', 0)
+        self.assertRaises(TypeError, setattr, item.value, 'charset', 'ascii')
+        self.assertRaises(TypeError, item.value.set, 'text/plain')
+
+        # parse() still returns values that can be changed
+        parsed = AcceptedList.parse(header, ContentType)[0]
+        parsed.value.set('text/plain')
+        assert parsed.value == 'text/plain'
@@ -62,3 +62,22 @@ class ContentTypeTest(unittest.TestCase):
         assert str(self.ct1) == 'application/json'
         assert str(self.ct2) == 'html'
         assert str(self.ct3) == 'text/*'
+
+    def test_set(self):
+        ct = ContentType('text/html; charset=latin-1', True)
+        assert ct.charset == 'latin-1'
+        ct.set('application/json')
+        assert str(ct) == 'application/json; charset=latin-1'
+        ct.set('???')
+        assert ct.charset == 'utf-8'
+
+    def test_parse_cache(self):
+        assert (ContentType._parse('text/plain') is
+            ContentType._parse('text/plain'))
+
+    def test_boundary(self):
+        ct = ContentType('multipart/byteranges; boundary=abc', True)
+        assert ct.boundary == 'abc'
+        assert str(ct) == 'multipart/byteranges; boundary=abc'
+        ct.set('text/plain')
+        assert ct.boundary is None
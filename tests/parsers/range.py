@@ -0,0 +1,22 @@
+import unittest
+from gimme.parsers.range import RangeHeader
+
+
+class RangeHeaderTest(unittest.TestCase):
+    def test_parse(self):
+        assert RangeHeader.parse('bytes=0-499').ranges == [(0, 499)]
+        assert RangeHeader.parse('bytes=500-, -200').ranges == [
+            (500, None), (None, 200)]
+
+    def test_invalid(self):
+        assert RangeHeader.parse('items=0-4') is None
+        assert RangeHeader.parse('bytes=5-4') is None
+        assert RangeHeader.parse('bytes=-') is None
+        assert RangeHeader.parse('bytes=a-b') is None
+        assert RangeHeader.parse('bytes=' + ','.join(['0-1'] * 17)) is None
+
+    def test_resolve(self):
+        byte_range = RangeHeader.parse('bytes=0-9,95-200,-5,100-')
+        assert byte_range.resolve(100) == [(0, 9), (95, 99), (95, 99)]
+        assert RangeHeader.parse('bytes=100-').resolve(100) == []
+        assert RangeHeader.parse('bytes=-5').resolve(0) == []
@@ -28,3 +28,14 @@ class StatusCodeTest(unittest.TestCase):
         assert self.status2.code == 100
         assert self.status1.text == 'Not Authorized'
         assert self.status2.text == 'Continue'
+
+    def test_status_lines(self):
+        assert StatusCode(404).get() is StatusCode(404).get()
+        assert StatusCode(418).get() == "418 I'm a teapot"
+
+    def test_eq(self):
+        assert self.status1 == 404
+        assert self.status1 == '404 Not Found'
+        assert self.status1 == StatusCode(404)
+        assert self.status2 != 404
+        self.assertRaises(ValueError, self.status1.__eq__, 'bogus')
@@ -103,6 +103,26 @@ class FormatTest(RendererSetUp, unittest.TestCase):
         assert html_response.type == 'text/html; charset=UTF-8'
         assert json_response.type == 'application/json'
 
+    def test_negotiate(self):
+        html = Template('index.html')
+        json_ = Json()
+        format_ = Format(html, 'text/html')
+
+        def negotiate(accept):
+            request = self.app.routes.match({
+                'PATH_INFO': '/',
+                'REQUEST_METHOD': 'GET',
+                'HTTP_ACCEPT': accept
+            })[0]
+            return format_.negotiate(request)
+
+        assert negotiate('application/json') is html
+        format_ | Format(json_, 'application/json')
+        assert negotiate('application/json') is json_
+        assert negotiate('application/json') is json_
+        assert negotiate('text/html;q=0.9,application/json;q=0.5') is html
+        assert format_.hit_rate == 0.25
+
 
 class BulkRendererTest(RendererSetUp, unittest.TestCase):
     def test_render(self):
@@ -70,3 +70,39 @@ class RequestTest(unittest.TestCase):
 
     def test_protocol(self):
         assert self.request.protocol == 'HTTP/1.1'
+
+
+class LazyRequestTest(unittest.TestCase):
+    def setUp(self):
+        self.environ = test_helpers.make_environ(uri='/somewhere?a=b')
+        self.request = Request(self.environ)
+
+    def test_lazy(self):
+        assert 'accepted' not in self.request.__dict__
+        assert 'query' not in self.request.__dict__
+        assert self.request.accepts('text/html')
+        assert self.request.accepted is self.request.accepted
+        assert self.request.query.a == 'b'
+        assert self.request.type is None
+
+    def test_assign(self):
+        self.request.cookies = {'a': 'b'}
+        assert self.request.cookies == {'a': 'b'}
+
+    def test_headers_view(self):
+        assert self.request.headers.user_agent.startswith('Mozilla')
+        assert self.request.headers['REQUEST_METHOD'] == 'GET'
+        assert 'input' not in self.request.headers
+        assert 'dnt' in self.request.headers
+        assert self.request.wsgi.url_scheme == 'http'
+        assert 'user_agent' not in self.request.wsgi
+
+        self.environ['REQUEST_METHOD'] = 'PUT'
+        assert self.request.headers.request_method == 'PUT'
+
+    def test_headers_read_only(self):
+        def assign():
+            self.request.headers.request_method = 'PUT'
+        self.assertRaises(TypeError, assign)
+        self.assertRaises(AttributeError, getattr, self.request.headers,
+            'missing')
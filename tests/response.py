@@ -1,6 +1,7 @@
 import unittest
 import gimme
 import datetime
+import tempfile
 from . import test_helpers
 
 
@@ -38,6 +39,16 @@ class ResponseTest(unittest.TestCase):
             domain='something.test.com', expires=360000)
         # Add assert to test cookie
 
+    def test_get_headers(self):
+        response = gimme.Response(200, {'content-type': 'text/plain'})
+        response.type = 'application/json'
+        response.cookie('a', '1')
+        response.cookie('b', '2')
+        headers = response.get_headers()
+        assert headers[0] == ('content-type', 'application/json; charset=utf-8')
+        assert [v for k, v in headers if k == 'Set-Cookie'] == [
+            'a=1; Path=/', 'b=2; Path=/']
+
     def test_clear_cookie(self):
         self.response.clear_cookie('cookie_test')
         assert self.response.headers['Set-Cookie'] == (
@@ -68,3 +79,44 @@ class ResponseTest(unittest.TestCase):
         assert self.response.headers['Link'] == (
             '<http://apple.com>; rel="prev", '
             '<http://google.com>; rel="next"')
+
+    def test_body(self):
+        response = gimme.Response(200, body='abcdefg')
+        assert response.body.get_iterable() == ['abcdefg']
+
+        response.chunk_size = 3
+        assert list(response.body) == ['abc', 'def', 'g']
+
+        response.body = u'\xe9t\xe9'
+        response.chunk_size = None
+        assert response.body.get_iterable() == ['\xc3\xa9t\xc3\xa9']
+
+        chunks = iter(['a', 'b'])
+        response.body = chunks
+        assert response.body.get_iterable() is chunks
+
+        response.body = None
+        assert response.body.get_iterable() == ['']
+        assert response.body.length == 0
+
+    def test_length(self):
+        response = gimme.Response(200, body='abc')
+        assert response.body.length == 3
+        assert ('Content-Length', '3') in response.get_headers()
+
+        response.body = u'\xe9'
+        assert response.body.length == 2
+
+        response.body = (i for i in 'abc')
+        assert response.body.length is None
+        assert 'Content-Length' not in dict(response.get_headers())
+
+        f = tempfile.TemporaryFile()
+        f.write('abcdef')
+        f.seek(2)
+        response.body = f
+        assert response.body.length == 4
+        f.close()
+
+        response = gimme.Response(304)
+        assert 'Content-Length' not in dict(response.get_headers())
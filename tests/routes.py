@@ -1,6 +1,15 @@
+import re
+import uuid
 import gimme
 import unittest
-from .test_helpers import make_environ
+from gimme.errors import RouteError
+from gimme.routes import Route, RouteMapping, Routes
+from gimme.dispatchers import (
+    LinearDispatcher,
+    TreeDispatcher,
+    RegexDispatcher
+)
+from .test_helpers import make_environ, StaticSetUp
 
 
 class RoutesTest(unittest.TestCase):
@@ -40,3 +49,565 @@ class RoutesTest(unittest.TestCase):
 
     self.assertEqual(request.params.id, '3')
     self.assertTrue(bool(request2))
+
+
+class StaticRoutesTest(unittest.TestCase):
+    def setUp(self):
+        self.app = gimme.App()
+
+        class TestController(gimme.Controller):
+            def static(self, request, response):
+                return 'static'
+
+            def dynamic(self, request, response):
+                return 'dynamic'
+
+        self.controller = TestController
+
+    def match(self, uri, method='GET'):
+        return self.app.routes.match(make_environ(method, uri))[2]
+
+    def test_static_path(self):
+        self.assertEqual(Route('/api/v1/status').static_path,
+            '/api/v1/status')
+        self.assertIsNone(Route('/user/:id').static_path)
+        self.assertIsNone(Route('*').static_path)
+
+    def test_fast_path(self):
+        self.app.routes.get('/health', self.controller.static)
+        self.app.routes.get('/:name', self.controller.dynamic)
+
+        static = self.app.routes._get_static('GET')
+        self.assertIn('/health', static)
+        self.assertIs(self.match('/health').method,
+            self.controller.static)
+        self.assertIs(self.match('/other').method,
+            self.controller.dynamic)
+
+    def test_priority(self):
+        self.app.routes.get('/:name', self.controller.dynamic)
+        self.app.routes.get('/health', self.controller.static)
+        self.app.routes.get('/about/team', self.controller.static)
+
+        static = self.app.routes._get_static('GET')
+        self.assertNotIn('/health', static)
+        self.assertIn('/about/team', static)
+        self.assertIs(self.match('/health').method,
+            self.controller.dynamic)
+
+    def test_strip_trailing_slash(self):
+        self.app.routes.get('/', self.controller.static)
+        self.app.routes.get('/health', self.controller.static)
+
+        self.assertIs(self.match('/health/').method,
+            self.controller.static)
+        self.assertIs(self.match('/').method, self.controller.static)
+
+        self.app.routes.strip_trailing_slash = False
+        self.assertIs(self.match('/health/'), self.app.routes.http404)
+
+    def test_trailing_slash_priority(self):
+        self.app.routes.get('/:name/', self.controller.dynamic)
+        self.app.routes.get('/health', self.controller.static)
+        self.app.routes.get('/:other', self.controller.dynamic)
+
+        self.assertIs(self.match('/health/').method,
+            self.controller.dynamic)
+        self.assertIs(self.match('/health').method,
+            self.controller.static)
+
+        for dispatcher in (LinearDispatcher, TreeDispatcher):
+            self.app.routes.dispatcher = dispatcher
+            self.app.routes._reset()
+            self.assertIs(self.match('/health/').method,
+                self.controller.dynamic)
+
+    def test_trailing_slash_param(self):
+        self.app.routes.get('/users/:id/', self.controller.dynamic)
+        self.app.routes.get('/posts/:id', self.controller.dynamic)
+
+        request, response, route = self.app.routes.match(
+            make_environ('GET', '/users/5/'))
+        self.assertIs(route.method, self.controller.dynamic)
+        self.assertEqual(request.params.id, '5')
+        self.assertIs(self.match('/posts/5/').method,
+            self.controller.dynamic)
+
+
+class TypedParamsTest(unittest.TestCase):
+    def setUp(self):
+        self.app = gimme.App()
+
+        class TestController(gimme.Controller):
+            def by_id(self, request, response):
+                pass
+
+            def by_key(self, request, response):
+                pass
+
+            def by_name(self, request, response):
+                pass
+
+        self.controller = TestController
+        self.app.routes.get('/users/:id<int>', TestController.by_id)
+        self.app.routes.get('/users/:key<uuid>', TestController.by_key)
+        self.app.routes.get('/users/:name', TestController.by_name)
+
+    def match(self, uri):
+        return self.app.routes.match(make_environ(uri=uri))
+
+    def test_int(self):
+        request, response, route = self.match('/users/42')
+        self.assertIs(route.method, self.controller.by_id)
+        self.assertEqual(request.params.id, 42)
+
+    def test_uuid(self):
+        request, response, route = self.match(
+            '/users/3f9a1c00-0000-4000-8000-00000000abcd')
+        self.assertIs(route.method, self.controller.by_key)
+        self.assertEqual(request.params.key,
+            uuid.UUID('3f9a1c00-0000-4000-8000-00000000abcd'))
+
+    def test_fall_through(self):
+        request, response, route = self.match('/users/bob')
+        self.assertIs(route.method, self.controller.by_name)
+        self.assertEqual(request.params.name, 'bob')
+
+    def test_regex(self):
+        route = Route('/files/:size<int>/:ratio<float>')
+        match = route.match('/files/10/0.5')
+        self.assertEqual(match.match.groupdict(), {'size': 10, 'ratio': 0.5,
+            '__last': '/'})
+        self.assertIsNone(route.match('/files/ten/0.5'))
+
+    def test_unknown_type(self):
+        with self.assertRaises(RouteError):
+            Route('/files/:size<huge>')
+
+
+class MethodsTest(unittest.TestCase):
+    def setUp(self):
+        self.app = gimme.App()
+
+        class TestController(gimme.Controller):
+            def show(self, request, response):
+                return 'show'
+
+            def update(self, request, response):
+                return 'update'
+
+        self.controller = TestController
+        self.app.routes.get('/user/:id', TestController.show)
+        self.app.routes.put('/user/:id', TestController.update)
+        self.app.routes.post('/login', TestController.update)
+
+    def start_response(self, status, headers):
+        self.status = status
+        self.headers = dict(headers)
+
+    def test_method_not_allowed(self):
+        request, response, route = self.app.routes.match(make_environ(
+            'DELETE', '/user/4'))
+        self.assertIs(route, self.app.routes.http405)
+        self.assertEqual(response.status, 405)
+        self.assertEqual(response.headers['Allow'],
+            'GET, HEAD, OPTIONS, PUT')
+
+    def test_not_found(self):
+        request, response, route = self.app.routes.match(make_environ(
+            'DELETE', '/nowhere'))
+        self.assertIs(route, self.app.routes.http404)
+
+    def test_options(self):
+        request, response, route = self.app.routes.match(make_environ(
+            'OPTIONS', '/login'))
+        self.assertIs(route, self.app.routes.options)
+        self.assertEqual(response.headers['Allow'], 'OPTIONS, POST')
+
+        body = self.app(make_environ('OPTIONS', '/login'),
+            self.start_response)
+        self.assertEqual(self.status, '200 OK')
+        self.assertEqual(body, [''])
+
+    def test_head(self):
+        request, response, route = self.app.routes.match(make_environ(
+            'HEAD', '/user/4'))
+        self.assertIs(route.method, self.controller.show)
+
+        body = self.app(make_environ('HEAD', '/user/4'), self.start_response)
+        self.assertEqual(self.status, '200 OK')
+        self.assertEqual(list(body), [])
+
+    def test_all(self):
+        self.app.routes.all('/anything', self.controller.show)
+        request, response, route = self.app.routes.match(make_environ(
+            'PATCH', '/anything'))
+        self.assertIs(route.method, self.controller.show)
+
+
+class HostRoutesTest(unittest.TestCase):
+    def setUp(self):
+        self.app = gimme.App()
+
+        class TestController(gimme.Controller):
+            def index(self, request, response):
+                return 'index'
+
+            def api(self, request, response):
+                return 'api'
+
+            def tenant(self, request, response):
+                return 'tenant'
+
+        self.controller = TestController
+        self.app.routes.get('/', TestController.index)
+        self.app.routes.get('/users', TestController.index)
+        self.app.routes.host('api.example.com').get('/users',
+            TestController.api)
+        self.app.routes.host('*.example.com').get('/users',
+            TestController.tenant)
+
+    def match(self, host, uri='/users', method='GET'):
+        environ = make_environ(method, uri)
+        environ['HTTP_HOST'] = host
+        return self.app.routes.match(environ)[2]
+
+    def test_exact(self):
+        self.assertIs(self.match('api.example.com').method,
+            self.controller.api)
+        self.assertIs(self.match('API.example.com:8080').method,
+            self.controller.api)
+
+    def test_wildcard(self):
+        self.assertIs(self.match('acme.example.com').method,
+            self.controller.tenant)
+        self.assertIs(self.match('a.b.example.com').method,
+            self.controller.tenant)
+        self.assertIs(self.match('example.com').method,
+            self.controller.index)
+
+    def test_fallback(self):
+        self.assertIs(self.match('api.example.com', '/').method,
+            self.controller.index)
+        self.assertIs(self.match('other.org').method, self.controller.index)
+
+    def test_allowed(self):
+        self.app.routes.host('api.example.com').post('/login',
+            self.controller.api)
+        route = self.match('api.example.com', '/login', 'DELETE')
+        self.assertIs(route, self.app.routes.http405)
+        self.assertIs(self.match('other.org', '/login'),
+            self.app.routes.http404)
+
+    def test_same_table(self):
+        self.assertIs(self.app.routes.host('API.example.com'),
+            self.app.routes.host('api.example.com'))
+
+    def test_freeze(self):
+        self.app.freeze()
+        self.assertTrue(self.app.routes.host('api.example.com').frozen)
+        self.assertRaises(RouteError, self.app.routes.host,
+            'www.example.com')
+        self.assertIs(self.match('api.example.com').method,
+            self.controller.api)
+
+
+class StaticMountTest(StaticSetUp, unittest.TestCase):
+    files = {'app.css': 'body {}'}
+
+    def setUp(self):
+        super(StaticMountTest, self).setUp()
+        self.app = gimme.App()
+        self.calls = []
+
+        class TestMiddleware(gimme.middleware.Middleware):
+            def enter(middleware):
+                self.calls.append(middleware.request.headers.path_info)
+
+        class TestController(gimme.Controller):
+            def page(self, request, response):
+                return 'page'
+
+        self.app.use(TestMiddleware)
+        self.app.routes.static('/assets', self.path, cache_control=60)
+        self.app.routes.get('/assets/missing.css', TestController.page)
+        self.app.routes.get('/assetsx/app.css', TestController.page)
+
+    def test_serve(self):
+        assert self.get('/assets/app.css') == 'body {}'
+        assert self.status == '200 OK'
+        assert self.headers['Cache-Control'] == 'public, max-age=60'
+        assert self.calls == []
+
+        assert self.get('/assets/app.css', 'HEAD') == ''
+        assert self.headers['Content-Length'] == '7'
+
+    def test_fall_through(self):
+        assert self.get('/assets/missing.css') == 'page'
+        assert self.get('/assetsx/app.css') == 'page'
+        self.get('/assets/app.css', 'POST')
+        assert self.status == '404 Not Found'
+        assert self.calls == ['/assets/missing.css', '/assetsx/app.css',
+            '/assets/app.css']
+
+    def test_host(self):
+        self.app.routes.host('cdn.example.com').static('/', self.path)
+        environ = make_environ('GET', '/app.css')
+        environ['HTTP_HOST'] = 'cdn.example.com'
+        request, response = self.app.routes.serve_static(environ)
+        assert response.body.length == 7
+        response.body.close()
+
+        environ['HTTP_HOST'] = 'www.example.com'
+        assert self.app.routes.serve_static(environ) is None
+
+    def test_freeze(self):
+        self.app.freeze()
+        self.assertRaises(RouteError, self.app.routes.static, '/more',
+            self.path)
+        assert self.get('/assets/app.css') == 'body {}'
+
+
+class RoutesCacheTest(unittest.TestCase):
+    def setUp(self):
+        self.app = gimme.App()
+        self.app.routes = Routes(self.app, cache_size=10)
+
+        class TestController(gimme.Controller):
+            def endpoint(self, request, response):
+                pass
+
+            def admin(self, request, response):
+                pass
+
+        self.controller = TestController
+
+    def test_hits(self):
+        self.app.routes.get('/user/:id', self.controller.endpoint)
+        cache = self.app.routes.cache
+
+        for i in xrange(3):
+            request, response, route = self.app.routes.match(make_environ(
+                uri='/user/4'))
+            self.assertEqual(request.params.id, '4')
+            request.params.id = 'changed'
+
+        self.assertEqual((cache.hits, cache.misses), (2, 1))
+        self.assertIn(('GET', '/user/4'), cache)
+
+    def test_not_found(self):
+        self.app.routes.post('/login', self.controller.endpoint)
+        cache = self.app.routes.cache
+
+        route = self.app.routes.match(make_environ(uri='/nowhere'))[2]
+        self.assertIs(route, self.app.routes.http404)
+        self.assertEqual(len(cache), 0)
+        self.assertNotIn('/nowhere', self.app.routes._allowed)
+
+        for i in xrange(2):
+            request, response, route = self.app.routes.match(
+                make_environ(uri='/login'))
+            self.assertIs(route, self.app.routes.http405)
+            self.assertEqual(response.headers['Allow'].value,
+                'OPTIONS, POST')
+        self.assertEqual(self.app.routes._allowed.get('/login'),
+            ['OPTIONS', 'POST'])
+        self.assertEqual(len(cache), 0)
+        self.assertEqual((cache.hits, cache.misses), (0, 3))
+
+    def test_match_fn(self):
+        self.app.routes.get('/user/:id', self.controller.admin,
+            fn=lambda uri, environ: 'HTTP_X_ADMIN' in environ)
+        self.app.routes.get('/user/:id', self.controller.endpoint)
+        self.app.routes.get('/about', self.controller.endpoint)
+
+        self.app.routes.match(make_environ(uri='/user/4'))
+        self.app.routes.match(make_environ(uri='/about'))
+        self.assertEqual(len(self.app.routes.cache), 0)
+
+        environ = make_environ(uri='/user/4')
+        environ['HTTP_X_ADMIN'] = '1'
+        request, response, route = self.app.routes.match(environ)
+        self.assertIs(route.method, self.controller.admin)
+
+    def test_reset(self):
+        self.app.routes.get('/user/:id', self.controller.endpoint)
+        self.app.routes.match(make_environ(uri='/user/4'))
+        self.app.routes.get('/about', self.controller.endpoint)
+        self.assertEqual(len(self.app.routes.cache), 0)
+
+
+class DispatcherTest(object):
+    patterns = [
+        '/',
+        '/about',
+        '/about/team',
+        '/user/:id',
+        '/user/:id/:message?',
+        '/user/:id/posts',
+        '/files/:name?/raw',
+        '/optional/:name?',
+        '/:section',
+        '/regex/.+',
+        '/a.b',
+        '/typed/:id<int>',
+        '/typed/:key<uuid>/:name?',
+        '/typed/:value<float>/x',
+        '/counted/:n<int>?',
+        Route(re.compile('^/compiled/(?P<thing>[0-9]+)$')),
+        '*'
+    ]
+
+    uris = [
+        '', '/', '/about', '/about/', '/about/team', '/user', '/user/',
+        '/user/4', '/user/4/', '/user//', '/user/4/hello', '/user/4/hello/',
+        '/user/4/posts', '/user/4/posts/', '/files//raw', '/files/x/raw',
+        '/optional', '/optional/', '/optional//', '/optional/x/',
+        '/regex/anything', '/a.b', '/compiled/12', '/compiled/x',
+        '/section', '/sec%20tion', '/deep/er/path', '/typed/12',
+        '/typed/12/', '/typed/abc', '/typed/3f9a1c00-0000-4000-8000-00000000abcd',
+        '/typed/3f9a1c00-0000-4000-8000-00000000abcd/x', '/typed/1.5/x',
+        '/typed/1/x', '/typed/1./x', '/counted', '/counted/', '/counted/7',
+        '/counted/seven'
+    ]
+
+    def make_mappings(self, patterns):
+        class TestController(gimme.Controller):
+            def endpoint(self, request, response):
+                pass
+
+        return [RouteMapping(i, [], TestController.endpoint)
+            for i in patterns]
+
+    def assert_same(self, mappings, uris, environ=None):
+        linear = LinearDispatcher(mappings)
+        tree = self.dispatcher(mappings)
+
+        for uri in uris:
+            expected = linear.match(uri, environ or {})
+            result = tree.match(uri, environ or {})
+
+            if expected is None:
+                self.assertIsNone(result, uri)
+            else:
+                self.assertIs(result[0], expected[0], uri)
+                self.assertEqual(result[1].match.groupdict(),
+                    expected[1].match.groupdict(), uri)
+
+    def test_matches_linear(self):
+        mappings = self.make_mappings(self.patterns)
+        self.assert_same(mappings, self.uris)
+
+        # Every suffix of the list, so that each pattern gets to be first
+        for i in xrange(len(mappings)):
+            self.assert_same(mappings[i:], self.uris)
+
+    def test_reversed(self):
+        self.assert_same(self.make_mappings(reversed(self.patterns)),
+            self.uris)
+
+    def test_route_list(self):
+        mappings = self.make_mappings([
+            Route('/one/:id') | Route('/two/:id'),
+            '/two/:other'
+        ])
+        self.assert_same(mappings, ['/one/1', '/two/2', '/three/3'])
+
+    def test_match_fn(self):
+        mappings = self.make_mappings(['/user/:id', '/user/:name'])
+        mappings[0].match_fn = lambda uri, environ: environ.get('admin')
+        tree = self.dispatcher(mappings)
+
+        self.assertIs(tree.match('/user/3', {})[0], mappings[1])
+        self.assertIs(tree.match('/user/3', {'admin': True})[0], mappings[0])
+        self.assert_same(mappings, ['/user/3'], {'admin': True})
+
+
+
+class TreeDispatcherTest(DispatcherTest, unittest.TestCase):
+    dispatcher = TreeDispatcher
+
+    def test_literal_dot(self):
+        # The regex treats "." as any character; the tree does not.
+        tree = TreeDispatcher(self.make_mappings(['/a.b']))
+        self.assertIsNotNone(tree.match('/a.b', {}))
+        self.assertIsNone(tree.match('/axb', {}))
+
+    def test_segments(self):
+        self.assertEqual(Route('/user/:id/:message?').segments, [
+            ('static', '', False, None),
+            ('static', 'user', False, None),
+            ('param', 'id', False, None),
+            ('last', 'message', True, None)
+        ])
+        self.assertIsNone(Route('/regex/.+').segments)
+        self.assertIsNone(Route('*').segments)
+        self.assertTrue(Route('*').wildcard)
+
+
+class RegexDispatcherTest(DispatcherTest, unittest.TestCase):
+    dispatcher = RegexDispatcher
+
+    def test_single_match_call(self):
+        mappings = self.make_mappings(self.patterns)
+        dispatcher = RegexDispatcher(mappings)
+        self.assertEqual(len(dispatcher._chunks), 1)
+
+    def test_uncombinable(self):
+        mappings = self.make_mappings([
+            Route(re.compile('^/(?P<a>[a-z])(?P=a)$')),
+            Route(re.compile('^/([0-9])\\1$')),
+            Route(re.compile('^/case$', re.I)),
+            Route(re.compile('^/(?i)inline$')),
+            '/:name'
+        ])
+        self.assert_same(mappings, ['/aa', '/ab', '/11', '/12', '/CASE',
+            '/INLINE', '/other'])
+        self.assertEqual(len(RegexDispatcher(mappings)._chunks), 5)
+
+    def test_group_limit(self):
+        mappings = self.make_mappings(['/a%s/:x/:y' % i for i in xrange(60)])
+        dispatcher = RegexDispatcher(mappings)
+        self.assertTrue(len(dispatcher._chunks) > 1)
+        self.assert_same(mappings, ['/a0/1/2', '/a59/1', '/a30', '/b/1'])
+
+    def test_routes(self):
+        app = gimme.App()
+        app.routes = Routes(app, dispatcher=RegexDispatcher)
+
+        class TestController(gimme.Controller):
+            def endpoint(self, request, response):
+                pass
+
+        app.routes.get(Route(re.compile('^/user/(?P<id>[0-9]+)$')),
+            TestController.endpoint)
+        request, response, route = app.routes.match(make_environ(
+            uri='/user/12'))
+        self.assertEqual(request.params.id, '12')
+
+        # Routes added later are picked up
+        app.routes.get('/late/:thing', TestController.endpoint)
+        request, response, route = app.routes.match(make_environ(
+            uri='/late/12'))
+        self.assertEqual(request.params.thing, '12')
+
+    def test_method_not_allowed(self):
+        app = gimme.App()
+        app.routes = Routes(app, dispatcher=RegexDispatcher)
+
+        class TestController(gimme.Controller):
+            def endpoint(self, request, response):
+                pass
+
+        app.routes.get('/user/:id', TestController.endpoint)
+        app.routes.put(Route(re.compile('^/user/(?P<id>[0-9]+)$')),
+            TestController.endpoint)
+        request, response, route = app.routes.match(make_environ(
+            'DELETE', '/user/4'))
+        self.assertIs(route, app.routes.http405)
+        self.assertEqual(response.headers['Allow'],
+            'GET, HEAD, OPTIONS, PUT')
+
+        request, response, route = app.routes.match(make_environ(
+            'DELETE', '/user/me'))
+        self.assertEqual(response.headers['Allow'], 'GET, HEAD, OPTIONS')
@@ -0,0 +1,78 @@
+import os
+import json
+import unittest
+import gimme
+from jinja2 import Environment, DictLoader
+from gimme.engines import Jinja2Engine
+from gimme.static import AssetManifest
+from .test_helpers import StaticSetUp
+
+
+class AssetManifestTest(StaticSetUp, unittest.TestCase):
+    files = {
+        'public/app.js': 'var a;',
+        'public/app.js.gz': 'gzipped',
+        'public/css/site.css': 'body {}'
+    }
+
+    def setUp(self):
+        super(AssetManifestTest, self).setUp()
+        self.public = os.path.join(self.path, 'public')
+        self.filename = os.path.join(self.path, 'manifest.json')
+        self.manifest = AssetManifest(self.filename)
+
+        self.app = gimme.App(engine=Jinja2Engine(
+            environment=Environment(loader=DictLoader({
+                'index.html': '{{ static_url("/assets/app.js") }} '
+                    '{{ static_url("missing.js") }}'
+            })), manifest=self.manifest))
+        self.app.routes.static('/assets', self.public,
+            manifest=self.manifest, cache_control=60)
+
+    def test_url(self):
+        url = self.manifest.url('/assets/app.js')
+        assert url == '/assets/app.%s.js' % (
+            self.manifest.files['/assets/app.js']['digest'][:8])
+        assert self.manifest.url('assets/css/site.css').startswith(
+            '/assets/css/site.')
+        assert self.manifest.url('/assets/other.js') == '/assets/other.js'
+        assert '/assets/app.js.gz' not in self.manifest.files
+        assert self.manifest.resolve(url) == '/assets/app.js'
+
+    def test_template(self):
+        assert self.app.engine.render('index.html', {}) == '%s /missing.js' % (
+            self.manifest.url('/assets/app.js'))
+
+    def test_serve(self):
+        assert self.get(self.manifest.url('/assets/app.js')) == 'var a;'
+        assert self.headers['Cache-Control'] == (
+            'public, max-age=31536000, immutable')
+
+        assert self.get(self.manifest.url('/assets/app.js'),
+            HTTP_ACCEPT_ENCODING='gzip') == 'gzipped'
+        assert self.headers['Content-Encoding'] == 'gzip'
+
+        assert self.get('/assets/app.js') == 'var a;'
+        assert self.headers['Cache-Control'] == 'public, max-age=60'
+
+        self.get('/assets/app.00000000.js')
+        assert self.status == '404 Not Found'
+
+    def test_persist(self):
+        self.assertRaises(ValueError, AssetManifest().save)
+        self.manifest.save()
+        with open(self.filename) as f:
+            assert json.load(f)['files'] == self.manifest.files
+
+        manifest = AssetManifest(self.filename)
+        manifest.hash_file = None
+        manifest.add(self.public, '/assets', ['.gz'])
+        assert manifest.files == self.manifest.files
+
+        self.write('public/app.js', 'var b;')
+        manifest = AssetManifest(self.filename)
+        manifest.add(self.public, '/assets', ['.gz'])
+        assert (manifest.url('/assets/app.js') !=
+            self.manifest.url('/assets/app.js'))
+        assert (manifest.url('/assets/css/site.css') ==
+            self.manifest.url('/assets/css/site.css'))
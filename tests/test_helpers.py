@@ -1,3 +1,6 @@
+import os
+import shutil
+import tempfile
 import StringIO
 from gimme.uri import URI
 
@@ -44,3 +47,39 @@ def make_environ(method='GET', uri='/', body=''):
         'wsgi.url_scheme': 'http',
         'wsgi.version': (1, 0)
     }
+
+
+class StaticSetUp(object):
+    '''
+    Writes :attr:`files`, a dict of relative path to contents, to a
+    temporary directory at ``self.path`` and removes it afterwards.
+    :meth:`get` requests a URI from ``self.app`` and keeps the status and
+    headers of the response.
+    '''
+    files = {}
+    uri = '/'
+
+    def setUp(self):
+        self.path = tempfile.mkdtemp()
+        for name, data in self.files.iteritems():
+            self.write(name, data)
+
+    def tearDown(self):
+        shutil.rmtree(self.path)
+
+    def write(self, name, data):
+        path = os.path.join(self.path, name)
+        if not os.path.isdir(os.path.dirname(path)):
+            os.makedirs(os.path.dirname(path))
+        with open(path, 'wb') as f:
+            f.write(data)
+
+    def start_response(self, status, headers):
+        self.status = status
+        self.headers = dict(headers)
+
+    def get(self, uri=None, method='GET', **headers):
+        environ = make_environ(method, uri or self.uri)
+        del environ['HTTP_ACCEPT_ENCODING']
+        environ.update(headers)
+        return ''.join(self.app(environ, self.start_response))